@@ -315,7 +315,8 @@ async def handler(event_data: Dict[str, Any], context: Any) -> Dict[str, Any]:
         event_data: {
             'file_path': '/path/to/report.txt',
             'filename': 'report.txt',
-            'content': '报告原文...',
+            'content': '报告原文...',  # 可选：未提供时从 file_path 读取
+            'sections': {...},  # 可选：章节摘要
             'report_id': 'optional_custom_id',
             'skip_analysis': False  # 新增：如果为 True，跳过分析（避免重复）
         }
@@ -346,6 +347,10 @@ async def handler(event_data: Dict[str, Any], context: Any) -> Dict[str, Any]:
     content = event_data.get('content')
     custom_report_id = event_data.get('report_id')
     
+    # 事件只携带摘要时，按需从原始文件加载全文
+    if content is None and file_path and Path(file_path).exists():
+        content = Path(file_path).read_text(encoding='utf-8')
+    
     # 验证输入
     if not content or len(content.strip()) < 50:
         return {
@@ -14,6 +14,7 @@ ActionsManager - 动作执行系统
 """
 
 import os
+import logging
 import json
 import asyncio
 import importlib.util
@@ -27,6 +28,8 @@ from .message_types import (
 )
 from database.database_manager import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 # 热重载功能（可选）
 try:
     from watchdog.observers import Observer
@@ -37,7 +40,7 @@ except ImportError:
     FileSystemEventHandler = None
     FileModifiedEvent = None
     WATCHDOG_AVAILABLE = False
-    print("[警告] watchdog 未安装，热重载功能已禁用. 安装: pip install watchdog")
+    logger.warning("watchdog 未安装，热重载功能已禁用. 安装: pip install watchdog")
 
 
 class ActionModule:
@@ -76,6 +79,9 @@ class ActionsManager:
         # 模板存储 {template_id: ActionModule}
         self.templates: Dict[str, ActionModule] = {}
         
+        # 模板统计缓存（模板加载/重载时失效）
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        
         # 实例存储 {instance_id: ActionInstance}
         self.instances: Dict[str, ActionInstance] = {}
         
@@ -85,7 +91,7 @@ class ActionsManager:
         # 确保日志目录存在
         self._ensure_logs_dir()
         
-        print(f"✅ ActionsManager 初始化完成")
+        logger.info("✅ ActionsManager 初始化完成")
     
     def _ensure_logs_dir(self):
         """确保日志目录存在"""
@@ -103,10 +109,11 @@ class ActionsManager:
             List[ActionTemplate]: 加载的模板列表
         """
         self.templates.clear()
+        self._stats_cache = None
         
         try:
             if not os.path.exists(self.actions_dir):
-                print("[ActionsManager] Actions 目录不存在，跳过加载")
+                logger.info("[ActionsManager] Actions 目录不存在，跳过加载")
                 return []
             
             files = os.listdir(self.actions_dir)
@@ -116,10 +123,10 @@ class ActionsManager:
                     await self._load_template(file)
         
         except Exception as e:
-            print(f"❌ 加载 Action 模板时出错: {e}")
+            logger.error("❌ 加载 Action 模板时出错: %s", e)
         
         templates = [module.config for module in self.templates.values()]
-        print(f"[ActionsManager] 已加载 {len(templates)} 个 Action 模板")
+        logger.info("[ActionsManager] 已加载 %s 个 Action 模板", len(templates))
         return templates
     
     async def _load_template(self, filename: str):
@@ -143,7 +150,7 @@ class ActionsManager:
             
             # 验证模块结构
             if not hasattr(module, 'config') or not hasattr(module, 'handler'):
-                print(f"⚠️  无效的 Action 模板 {filename}: 缺少 config 或 handler")
+                logger.warning("⚠️  无效的 Action 模板 %s: 缺少 config 或 handler", filename)
                 return
             
             config = module.config
@@ -151,7 +158,7 @@ class ActionsManager:
             
             # 验证 config 类型
             if not isinstance(config, dict):
-                print(f"⚠️  无效的 Action 模板 {filename}: config 必须是 dict")
+                logger.warning("⚠️  无效的 Action 模板 %s: config 必须是 dict", filename)
                 return
             
             # 转换为 ActionTemplate
@@ -165,12 +172,11 @@ class ActionsManager:
             
             # 存储模板
             self.templates[template.id] = ActionModule(template, handler)
-            print(f"[ActionsManager] ✓ 加载模板: {template.id} ({template.name})")
+            self._stats_cache = None
+            logger.info("[ActionsManager] ✓ 加载模板: %s (%s)", template.id, template.name)
         
         except Exception as e:
-            print(f"❌ 加载模板 {filename} 时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ 加载模板 %s 时出错: %s", filename, e)
     
     def get_template(self, template_id: str) -> Optional[ActionTemplate]:
         """
@@ -208,7 +214,7 @@ class ActionsManager:
             instance: Action 实例
         """
         self.instances[instance.instanceId] = instance
-        print(f"[ActionsManager] 注册 Action 实例: {instance.instanceId} ({instance.label})")
+        logger.debug("[ActionsManager] 注册 Action 实例: %s (%s)", instance.instanceId, instance.label)
     
     def get_instance(self, instance_id: str) -> Optional[ActionInstance]:
         """
@@ -285,8 +291,7 @@ class ActionsManager:
                 message=f"Action 执行失败: {error}"
             )
             context.log(f"Action 执行失败: {error}", "error")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Action %s 执行失败", instance_id)
         
         # 4. 计算执行时间
         duration = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -340,7 +345,7 @@ class ActionsManager:
                 f.write(json.dumps(log_data, ensure_ascii=False) + '\n')
         
         except Exception as e:
-            print(f"❌ 记录 Action 日志失败: {e}")
+            logger.error("❌ 记录 Action 日志失败: %s", e)
     
     # ==================== 热重载 ====================
     
@@ -353,11 +358,11 @@ class ActionsManager:
             on_change: 变化回调函数
         """
         if not WATCHDOG_AVAILABLE:
-            print("[ActionsManager] 热重载功能不可用 (watchdog 未安装)")
+            logger.warning("[ActionsManager] 热重载功能不可用 (watchdog 未安装)")
             return
         
         if not os.path.exists(self.actions_dir):
-            print("[ActionsManager] Actions 目录不存在，跳过监听")
+            logger.info("[ActionsManager] Actions 目录不存在，跳过监听")
             return
         
         class ActionTemplateHandler(FileSystemEventHandler):
@@ -368,7 +373,7 @@ class ActionsManager:
             def on_modified(handler_self, event):
                 if event.src_path.endswith('.py'):
                     filename = os.path.basename(event.src_path)
-                    print(f"[ActionsManager] 检测到文件变化: {filename}")
+                    logger.info("[ActionsManager] 检测到文件变化: %s", filename)
                     
                     # 重新加载所有模板
                     asyncio.create_task(handler_self._reload_templates())
@@ -383,14 +388,14 @@ class ActionsManager:
         self._observer.schedule(event_handler, self.actions_dir, recursive=False)
         self._observer.start()
         
-        print(f"✅ ActionsManager 开始监听文件变化: {self.actions_dir}")
+        logger.info("✅ ActionsManager 开始监听文件变化: %s", self.actions_dir)
     
     def stop_watching(self):
         """停止监听文件变化"""
         if self._observer:
             self._observer.stop()
             self._observer.join()
-            print("✅ ActionsManager 停止监听文件变化")
+            logger.info("✅ ActionsManager 停止监听文件变化")
     
     # ==================== 统计信息 ====================
     
@@ -402,3 +407,17 @@ class ActionsManager:
             'total_instances': len(self.instances),
             'watching': self._observer is not None and self._observer.is_alive() if self._observer else False
         }
+    
+    def get_stats_cached(self) -> Dict[str, Any]:
+        """
+        获取模板统计信息（缓存结果，仅在模板变更后重新计算）
+        
+        Returns:
+            Dict: {'total_templates': 模板总数, 'template_list': 模板 ID 列表}
+        """
+        if self._stats_cache is None:
+            self._stats_cache = {
+                'total_templates': len(self.templates),
+                'template_list': list(self.templates.keys())
+            }
+        return self._stats_cache
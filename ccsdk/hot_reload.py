@@ -0,0 +1,124 @@
+"""
+HotReloadWatcher - 插件目录统一热重载
+
+核心功能:
+1. 单个 watchdog Observer 同时监听 Listeners / Actions / UI States 目录
+2. 文件事件（修改 / 新建 / 移动）从 watchdog 线程安全地转交给事件循环（call_soon_threadsafe）
+3. 去抖动 - 同一目录短时间内的多次修改只触发一次重载
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 热重载功能（可选）
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+ReloadCallback = Callable[[], Awaitable[None]]
+
+
+class _PluginFileHandler(FileSystemEventHandler):
+    """把插件 .py 文件的修改 / 新建 / 移动事件转发到事件循环"""
+
+    def __init__(self, watcher: 'HotReloadWatcher', directory: str):
+        self.watcher = watcher
+        self.directory = directory
+
+    def on_modified(self, event):
+        self._handle(event, event.src_path)
+
+    def on_created(self, event):
+        self._handle(event, event.src_path)
+
+    def on_moved(self, event):
+        # 编辑器原子保存（写临时文件后重命名）只产生移动事件，以目标路径为准
+        self._handle(event, event.dest_path)
+
+    def _handle(self, event, path: str):
+        if event.is_directory or not path.endswith('.py'):
+            return
+        filename = os.path.basename(path)
+        if filename.startswith('_') or filename.startswith('.'):
+            return
+        # watchdog 回调运行在观察者线程中，不能直接创建任务
+        self.watcher.loop.call_soon_threadsafe(self.watcher._schedule_reload, self.directory)
+
+
+class HotReloadWatcher:
+    """多目录热重载（一个 Observer 线程，按目录分发重载回调）"""
+
+    def __init__(self, debounce: float = 0.2):
+        """
+        初始化
+
+        Args:
+            debounce: 去抖动时间（秒），编辑器保存一次通常会产生多次修改事件
+        """
+        self.debounce = debounce
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._callbacks: Dict[str, ReloadCallback] = {}
+        self._pending: Set[str] = set()
+        # 事件循环只持有任务的弱引用，这里保留强引用，任务结束后移除
+        self._tasks: Set[asyncio.Task] = set()
+        self._observer = None
+
+    def register(self, directory: str, on_reload: ReloadCallback):
+        """
+        注册需要监听的目录
+
+        Args:
+            directory: 插件目录
+            on_reload: 目录内文件变化时调用的异步重载函数
+        """
+        self._callbacks[directory] = on_reload
+
+    def start(self) -> bool:
+        """在当前事件循环中启动监听，返回是否成功启动"""
+        if not WATCHDOG_AVAILABLE:
+            logger.warning("[HotReload] watchdog 未安装，热重载功能已禁用. 安装: pip install watchdog")
+            return False
+
+        self.loop = asyncio.get_running_loop()
+        self._observer = Observer()
+        for directory in self._callbacks:
+            if not os.path.isdir(directory):
+                logger.warning("[HotReload] 目录不存在，跳过监听: %s", directory)
+                continue
+            self._observer.schedule(_PluginFileHandler(self, directory), directory, recursive=False)
+            logger.info("[HotReload] Watching %s", directory)
+        self._observer.start()
+        return True
+
+    def stop(self):
+        """停止监听"""
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _schedule_reload(self, directory: str):
+        """在事件循环中调用：同一目录已有待执行的重载时直接合并"""
+        if directory in self._pending:
+            return
+        self._pending.add(directory)
+        task = self.loop.create_task(self._reload(directory))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reload(self, directory: str):
+        await asyncio.sleep(self.debounce)
+        self._pending.discard(directory)
+        try:
+            await self._callbacks[directory]()
+        except Exception as e:
+            logger.error("[HotReload] Error reloading %s: %s", directory, e)
@@ -11,6 +11,7 @@
 """
 
 import os
+import logging
 import sys
 import importlib.util
 from pathlib import Path
@@ -18,6 +19,8 @@ from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 # watchdog 是可选依赖，用于热重载
 try:
     from watchdog.observers import Observer
@@ -25,7 +28,7 @@ try:
     WATCHDOG_AVAILABLE = True
 except ImportError:
     WATCHDOG_AVAILABLE = False
-    print("[警告] watchdog 未安装,热重载功能已禁用. 安装: pip install watchdog")
+    logger.warning("watchdog 未安装,热重载功能已禁用. 安装: pip install watchdog")
 
 from .message_types import (
     ListenerConfig,
@@ -84,9 +87,9 @@ class ListenerContext:
         else:
             priority = "normal"
         
-        print(f"[ListenerContext] NOTIFY from {self.listener_id}:")
-        print(f"  - Message: {message}")
-        print(f"  - Priority: {priority}")
+        logger.debug("[ListenerContext] NOTIFY from %s:", self.listener_id)
+        logger.debug("  - Message: %s", message)
+        logger.debug("  - Priority: %s", priority)
         
         if self.notification_callback:
             await self.notification_callback({
@@ -106,7 +109,7 @@ class ListenerContext:
             report_id: 报告 ID
             tag: 标签名称
         """
-        print(f"[ListenerContext] Adding tag '{tag}' to report {report_id}")
+        logger.debug("[ListenerContext] Adding tag '%s' to report %s", tag, report_id)
         # TODO: 实现数据库操作
         # await self.database.add_report_tag(report_id, tag)
     
@@ -122,7 +125,7 @@ class ListenerContext:
         Returns:
             结构化数据
         """
-        print(f"[ListenerContext] callAgent() called by {self.listener_id}")
+        logger.debug("[ListenerContext] callAgent() called by %s", self.listener_id)
         return await self.agent_tools.call_agent(prompt, schema)
     
     @property
@@ -138,14 +141,14 @@ class ListenerContext:
             async def get(ctx_self, state_id: str):
                 """获取 UI State"""
                 if not ctx_self.ui_manager:
-                    print('[ListenerContext] UIStateManager not available')
+                    logger.info("[ListenerContext] UIStateManager not available")
                     return None
                 return await ctx_self.ui_manager.get_state(state_id)
             
             async def set(ctx_self, state_id: str, data: Any):
                 """设置 UI State"""
                 if not ctx_self.ui_manager:
-                    print('[ListenerContext] UIStateManager not available')
+                    logger.info("[ListenerContext] UIStateManager not available")
                     return
                 await ctx_self.ui_manager.set_state(state_id, data)
             
@@ -161,11 +164,11 @@ class ListenerContext:
         """记录日志"""
         prefix = f"[{self.listener_id}]"
         if level == "error":
-            print(f"❌ {prefix} {message}")
+            logger.error("❌ %s %s", prefix, message)
         elif level == "warn":
-            print(f"⚠️  {prefix} {message}")
+            logger.warning("⚠️  %s %s", prefix, message)
         else:
-            print(f"✓ {prefix} {message}")
+            logger.info("✓ %s %s", prefix, message)
 
 
 class ListenersManager:
@@ -231,9 +234,9 @@ class ListenersManager:
             for file in files:
                 await self._load_listener(file)
             
-            print(f"[ListenersManager] Loaded {len(self.listeners)} listener(s)")
+            logger.info("[ListenersManager] Loaded %s listener(s)", len(self.listeners))
         except Exception as e:
-            print(f"[ListenersManager] Error loading listeners: {e}")
+            logger.error("[ListenersManager] Error loading listeners: %s", e)
         
         return [l['config'] for l in self.listeners.values()]
     
@@ -252,7 +255,7 @@ class ListenersManager:
             # 动态导入模块（支持热重载）
             spec = importlib.util.spec_from_file_location(module_name, file_path)
             if not spec or not spec.loader:
-                print(f"[ListenersManager] Failed to load spec for {filename}")
+                logger.error("[ListenersManager] Failed to load spec for %s", filename)
                 return
             
             module = importlib.util.module_from_spec(spec)
@@ -266,7 +269,7 @@ class ListenersManager:
             
             # 验证模块导出
             if not hasattr(module, 'config') or not hasattr(module, 'handler'):
-                print(f"[ListenersManager] Invalid listener {filename}: missing config or handler")
+                logger.warning("[ListenersManager] Invalid listener %s: missing config or handler", filename)
                 return
             
             config = module.config
@@ -282,14 +285,12 @@ class ListenersManager:
                 }
                 listener_id = config['id'] if isinstance(config, dict) else config.id
                 listener_name = config['name'] if isinstance(config, dict) else config.name
-                print(f"[ListenersManager] ✓ Loaded listener: {listener_id} ({listener_name})")
+                logger.info("[ListenersManager] ✓ Loaded listener: %s (%s)", listener_id, listener_name)
             else:
                 listener_id = config['id'] if isinstance(config, dict) else config.id
-                print(f"[ListenersManager] ✗ Skipped disabled listener: {listener_id}")
+                logger.info("[ListenersManager] ✗ Skipped disabled listener: %s", listener_id)
         except Exception as e:
-            print(f"[ListenersManager] Error loading listener {filename}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ListenersManager] Error loading listener %s: %s", filename, e)
     
     def _create_context(self, listener_config: Any) -> ListenerContext:
         """
@@ -330,7 +331,7 @@ class ListenersManager:
         if not matching_listeners:
             return
         
-        print(f"[ListenersManager] Triggering {len(matching_listeners)} listener(s) for event: {event}")
+        logger.debug("[ListenersManager] Triggering %s listener(s) for event: %s", len(matching_listeners), event)
         
         # 执行每个 Listener
         for listener in matching_listeners:
@@ -367,10 +368,10 @@ class ListenersManager:
                         reason="Listener completed successfully"
                     )
                 
-                print(f"[ListenersManager] ✓ {listener_id} executed successfully")
+                logger.debug("[ListenersManager] ✓ %s executed successfully", listener_id)
             except Exception as err:
                 error = err
-                print(f"[ListenersManager] ✗ {listener_id} failed: {error}")
+                logger.error("[ListenersManager] ✗ %s failed: %s", listener_id, error)
                 
                 # 创建错误结果
                 result = ListenerResult(
@@ -429,16 +430,16 @@ class ListenersManager:
             on_change: 文件变化时的回调函数
         """
         if not WATCHDOG_AVAILABLE:
-            print("[ListenersManager] watchdog 未安装，无法启用热重载")
+            logger.warning("[ListenersManager] watchdog 未安装，无法启用热重载")
             return
         
         if self.watcher_active:
-            print("[ListenersManager] File watcher already active")
+            logger.info("[ListenersManager] File watcher already active")
             return
         
         try:
             self.watcher_active = True
-            print(f"[ListenersManager] Watching {self.listeners_dir} for changes...")
+            logger.info("[ListenersManager] Watching %s for changes...", self.listeners_dir)
             
             # 创建事件处理器
             class ListenerFileHandler(FileSystemEventHandler):
@@ -449,11 +450,11 @@ class ListenersManager:
                     if isinstance(event, FileModifiedEvent) and event.src_path.endswith('.py'):
                         filename = os.path.basename(event.src_path)
                         if not filename.startswith('_') and not filename.startswith('.'):
-                            print(f"[ListenersManager] File modified: {filename}")
+                            logger.info("[ListenersManager] File modified: %s", filename)
                             asyncio.create_task(handler_self._reload_listeners())
                 
                 async def _reload_listeners(handler_self):
-                    print("[ListenersManager] Reloading listeners...")
+                    logger.info("[ListenersManager] Reloading listeners...")
                     listeners = await handler_self.manager.load_all_listeners()
                     await on_change(listeners)
             
@@ -463,9 +464,9 @@ class ListenersManager:
             self.observer.schedule(event_handler, self.listeners_dir, recursive=False)
             self.observer.start()
             
-            print("[ListenersManager] File watcher started")
+            logger.info("[ListenersManager] File watcher started")
         except Exception as e:
-            print(f"[ListenersManager] Error watching listeners: {e}")
+            logger.error("[ListenersManager] Error watching listeners: %s", e)
             self.watcher_active = False
     
     def stop_watching(self) -> None:
@@ -474,7 +475,7 @@ class ListenersManager:
             self.observer.stop()
             self.observer.join()
             self.watcher_active = False
-            print("[ListenersManager] File watcher stopped")
+            logger.info("[ListenersManager] File watcher stopped")
     
     def get_stats(self) -> Dict[str, Any]:
         """
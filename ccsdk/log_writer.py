@@ -5,18 +5,23 @@
 功能:
 1. 为每个 Listener 创建独立的 JSONL 日志文件
 2. 支持日志追加写入
-3. 支持读取最近的 N 条日志
+3. 支持读取最近的 N 条日志（列表或异步迭代）
 4. 支持读取所有 Listeners 的日志并合并排序
 """
 
+import asyncio
 import json
+import logging
 import os
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterator
 from datetime import datetime
 
 from .message_types import ListenerLogEntry
 
+logger = logging.getLogger(__name__)
+
 
 class LogWriter:
     """
@@ -40,7 +45,7 @@ class LogWriter:
         try:
             Path(self.logs_dir).mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            print(f"[LogWriter] Failed to create logs directory: {e}")
+            logger.error("[LogWriter] Failed to create logs directory: %s", e)
     
     async def append_log(self, listener_id: str, entry: ListenerLogEntry) -> None:
         """
@@ -61,7 +66,58 @@ class LogWriter:
             with open(log_file, 'a', encoding='utf-8') as f:
                 f.write(log_line)
         except Exception as e:
-            print(f"[LogWriter] Failed to write log for listener {listener_id}: {e}")
+            logger.error("[LogWriter] Failed to write log for listener %s: %s", listener_id, e)
+    
+    async def iter_logs(
+        self,
+        listener_id: str,
+        limit: int = 50
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐条产出指定 Listener 的最近 N 条日志
+        
+        在线程池中按行扫描并解析文件（不阻塞事件循环），
+        只保留最后 limit 条有效日志（跳过损坏的行），内存占用与文件大小无关
+        
+        Args:
+            listener_id: Listener ID
+            limit: 返回的最大条目数
+        
+        Yields:
+            日志条目（最新的在前）
+        """
+        log_file = os.path.join(self.logs_dir, f"{listener_id}.jsonl")
+        
+        # 检查文件是否存在
+        if not os.path.exists(log_file):
+            return
+        
+        try:
+            entries = await asyncio.to_thread(self._tail_entries, log_file, limit)
+        except Exception as e:
+            logger.error("[LogWriter] Failed to read logs for listener %s: %s", listener_id, e)
+            return
+        
+        # 倒序产出，最新的在前
+        for entry in reversed(entries):
+            yield entry
+    
+    @classmethod
+    def _tail_entries(cls, log_file: str, limit: int) -> deque:
+        """读取文件中最后 limit 条有效日志（阻塞 IO，在线程中调用）"""
+        with open(log_file, 'r', encoding='utf-8') as f:
+            return deque(cls._parse_lines(f), maxlen=limit)
+    
+    @staticmethod
+    def _parse_lines(lines) -> Iterator[Dict[str, Any]]:
+        """逐行解析 JSONL，跳过空行和损坏的行"""
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
     
     async def read_logs(
         self, 
@@ -79,32 +135,7 @@ class LogWriter:
         Returns:
             日志条目列表（最新的在前）
         """
-        try:
-            log_file = os.path.join(self.logs_dir, f"{listener_id}.jsonl")
-            
-            # 检查文件是否存在
-            if not os.path.exists(log_file):
-                return []
-            
-            # 读取文件内容
-            with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            
-            # 解析 JSON 行
-            entries = []
-            for line in lines:
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-            
-            # 返回最后 N 条记录（倒序，最新的在前）
-            return list(reversed(entries[-limit:]))
-        except Exception as e:
-            print(f"[LogWriter] Failed to read logs for listener {listener_id}: {e}")
-            return []
+        return [entry async for entry in self.iter_logs(listener_id, limit)]
     
     async def read_all_logs(
         self, 
@@ -149,5 +180,5 @@ class LogWriter:
             
             return all_entries[:limit]
         except Exception as e:
-            print(f"[LogWriter] Failed to read all logs: {e}")
+            logger.error("[LogWriter] Failed to read all logs: %s", e)
             return []
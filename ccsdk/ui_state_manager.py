@@ -11,6 +11,7 @@
 """
 
 import os
+import logging
 import sys
 import importlib.util
 from pathlib import Path
@@ -19,6 +20,8 @@ from datetime import datetime
 import asyncio
 import json
 
+logger = logging.getLogger(__name__)
+
 # 热重载功能是可选的,如果未安装 watchdog 则禁用
 try:
     from watchdog.observers import Observer
@@ -29,7 +32,7 @@ except ImportError:
     FileSystemEventHandler = None
     FileModifiedEvent = None
     WATCHDOG_AVAILABLE = False
-    print("[警告] watchdog 未安装,热重载功能已禁用. 安装: pip install watchdog")
+    logger.warning("watchdog 未安装,热重载功能已禁用. 安装: pip install watchdog")
 
 from .message_types import UIStateTemplate, UIStateLogEntry
 from database.database_manager import DatabaseManager
@@ -105,9 +108,9 @@ class UIStateManager:
             for file in files:
                 await self._load_template(file)
             
-            print(f"[UIStateManager] Loaded {len(self.templates)} UI state template(s)")
+            logger.info("[UIStateManager] Loaded %s UI state template(s)", len(self.templates))
         except Exception as e:
-            print(f"[UIStateManager] Error loading templates: {e}")
+            logger.error("[UIStateManager] Error loading templates: %s", e)
         
         return list(self.templates.values())
     
@@ -126,7 +129,7 @@ class UIStateManager:
             # 动态导入模块 (支持热重载)
             spec = importlib.util.spec_from_file_location(module_name, file_path)
             if not spec or not spec.loader:
-                print(f"[UIStateManager] Failed to load spec for {filename}")
+                logger.error("[UIStateManager] Failed to load spec for %s", filename)
                 return
             
             module = importlib.util.module_from_spec(spec)
@@ -140,14 +143,14 @@ class UIStateManager:
             
             # 验证模板导出
             if not hasattr(module, 'config'):
-                print(f"[UIStateManager] Invalid template {filename}: missing config")
+                logger.warning("[UIStateManager] Invalid template %s: missing config", filename)
                 return
             
             config = module.config
             
             # 验证必需字段
             if not isinstance(config, dict) or 'id' not in config or 'initialState' not in config:
-                print(f"[UIStateManager] Invalid template {filename}: missing id or initialState")
+                logger.warning("[UIStateManager] Invalid template %s: missing id or initialState", filename)
                 return
             
             # 转换为 UIStateTemplate 对象
@@ -159,12 +162,10 @@ class UIStateManager:
             )
             
             self.templates[template.id] = template
-            print(f"[UIStateManager] ✓ Loaded template: {template.id} ({template.name})")
+            logger.info("[UIStateManager] ✓ Loaded template: %s (%s)", template.id, template.name)
             
         except Exception as e:
-            print(f"[UIStateManager] Error loading template {filename}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[UIStateManager] Error loading template %s: %s", filename, e)
     
     def get_template(self, template_id: str) -> Optional[UIStateTemplate]:
         """
@@ -196,8 +197,8 @@ class UIStateManager:
             Any: 状态数据,如果不存在则返回模板的 initialState
         """
         try:
-            # 1. 尝试从数据库获取
-            result = self.database.get_ui_state(state_id)
+            # 1. 尝试从数据库获取（get_ui_state 是同步 sqlite3 调用，放到线程中执行）
+            result = await asyncio.to_thread(self.database.get_ui_state, state_id)
             
             if result is not None:
                 return result
@@ -210,7 +211,7 @@ class UIStateManager:
             return None
             
         except Exception as e:
-            print(f"[UIStateManager] Error getting state {state_id}: {e}")
+            logger.error("[UIStateManager] Error getting state %s: %s", state_id, e)
             return None
     
     async def set_state(self, state_id: str, data: Any) -> None:
@@ -232,10 +233,10 @@ class UIStateManager:
             # 3. 通知所有订阅者 (WebSocket 广播)
             self._notify_state_update(state_id, data)
             
-            print(f"[UIStateManager] ✓ State updated: {state_id}")
+            logger.debug("[UIStateManager] ✓ State updated: %s", state_id)
             
         except Exception as e:
-            print(f"[UIStateManager] Error setting state {state_id}: {e}")
+            logger.error("[UIStateManager] Error setting state %s: %s", state_id, e)
             raise
     
     async def list_states(self) -> List[Dict[str, str]]:
@@ -249,7 +250,7 @@ class UIStateManager:
         try:
             return await self.database.list_ui_states()
         except Exception as e:
-            print(f"[UIStateManager] Error listing states: {e}")
+            logger.error("[UIStateManager] Error listing states: %s", e)
             return []
     
     async def delete_state(self, state_id: str) -> None:
@@ -262,9 +263,9 @@ class UIStateManager:
         """
         try:
             await self.database.delete_ui_state(state_id)
-            print(f"[UIStateManager] ✓ State deleted: {state_id}")
+            logger.debug("[UIStateManager] ✓ State deleted: %s", state_id)
         except Exception as e:
-            print(f"[UIStateManager] Error deleting state {state_id}: {e}")
+            logger.error("[UIStateManager] Error deleting state %s: %s", state_id, e)
             raise
     
     async def initialize_state_if_needed(self, state_id: str) -> bool:
@@ -287,16 +288,16 @@ class UIStateManager:
             # 2. 查找模板
             template = self.templates.get(state_id)
             if not template:
-                print(f"[UIStateManager] No template found for state: {state_id}")
+                logger.debug("[UIStateManager] No template found for state: %s", state_id)
                 return False
             
             # 3. 使用 initialState 初始化
             await self.set_state(state_id, template.initialState)
-            print(f"[UIStateManager] ✓ Initialized state: {state_id}")
+            logger.debug("[UIStateManager] ✓ Initialized state: %s", state_id)
             return True
             
         except Exception as e:
-            print(f"[UIStateManager] Error initializing state {state_id}: {e}")
+            logger.error("[UIStateManager] Error initializing state %s: %s", state_id, e)
             return False
     
     # ============================================================================
@@ -335,7 +336,7 @@ class UIStateManager:
             try:
                 callback(state_id, data)
             except Exception as e:
-                print(f"[UIStateManager] Error in update callback: {e}")
+                logger.error("[UIStateManager] Error in update callback: %s", e)
     
     # ============================================================================
     # 日志记录
@@ -369,7 +370,7 @@ class UIStateManager:
             await write_log()
             
         except Exception as e:
-            print(f"[UIStateManager] Failed to log state update: {e}")
+            logger.error("[UIStateManager] Failed to log state update: %s", e)
     
     # ============================================================================
     # 热重载
@@ -384,16 +385,16 @@ class UIStateManager:
             on_change: 文件变化时的回调函数
         """
         if not WATCHDOG_AVAILABLE:
-            print("[UIStateManager] 热重载功能不可用 (watchdog 未安装)")
+            logger.warning("[UIStateManager] 热重载功能不可用 (watchdog 未安装)")
             return
         
         if self.watcher_active:
-            print("[UIStateManager] File watcher already active")
+            logger.info("[UIStateManager] File watcher already active")
             return
         
         try:
             self.watcher_active = True
-            print(f"[UIStateManager] Watching {self.ui_states_dir} for changes...")
+            logger.info("[UIStateManager] Watching %s for changes...", self.ui_states_dir)
             
             # 创建事件处理器
             class UIStateFileHandler(FileSystemEventHandler):
@@ -404,11 +405,11 @@ class UIStateManager:
                     if isinstance(event, FileModifiedEvent) and event.src_path.endswith('.py'):
                         filename = os.path.basename(event.src_path)
                         if not filename.startswith('_') and not filename.startswith('.'):
-                            print(f"[UIStateManager] File modified: {filename}")
+                            logger.info("[UIStateManager] File modified: %s", filename)
                             asyncio.create_task(handler_self._reload_templates())
                 
                 async def _reload_templates(handler_self):
-                    print("[UIStateManager] Reloading templates...")
+                    logger.info("[UIStateManager] Reloading templates...")
                     templates = await handler_self.manager.load_all_templates()
                     await on_change(templates)
             
@@ -418,10 +419,10 @@ class UIStateManager:
             self.observer.schedule(event_handler, self.ui_states_dir, recursive=False)
             self.observer.start()
             
-            print("[UIStateManager] File watcher started")
+            logger.info("[UIStateManager] File watcher started")
             
         except Exception as e:
-            print(f"[UIStateManager] Error watching templates: {e}")
+            logger.error("[UIStateManager] Error watching templates: %s", e)
             self.watcher_active = False
     
     def stop_watching(self) -> None:
@@ -430,7 +431,7 @@ class UIStateManager:
             self.observer.stop()
             self.observer.join()
             self.watcher_active = False
-            print("[UIStateManager] File watcher stopped")
+            logger.info("[UIStateManager] File watcher stopped")
     
     # ============================================================================
     # 工具方法
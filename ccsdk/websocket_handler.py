@@ -15,15 +15,19 @@ Finance Agent WebSocket Handler
 """
 
 import asyncio
-import json
+import logging
 import time
 from typing import Dict, Set, Optional, Any, List
 from dataclasses import dataclass
 
+import orjson
+
 from .session import Session
 from .message_types import WSClient, IncomingMessage, WSReportAnalysisUpdateMessage, WSAlertTriggeredMessage
 from database.database_manager import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 # UI State Manager (可选)
 try:
     from .ui_state_manager import UIStateManager
@@ -33,6 +37,11 @@ except ImportError:
     UI_STATE_AVAILABLE = False
 
 
+def _dumps(obj: Any) -> str:
+    """序列化 WebSocket 文本帧（orjson 原生输出 UTF-8，等价于 ensure_ascii=False）"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 @dataclass
 class WebSocketHandler:
     """
@@ -78,7 +87,7 @@ class WebSocketHandler:
         """启动 WebSocket Handler"""
         # 启动报告数据监控 (对应 TS 的 initEmailWatcher)
         self._report_watcher_task = asyncio.create_task(self._init_report_watcher())
-        print("✅ WebSocket Handler started")
+        logger.info("✅ WebSocket Handler started")
         
     async def stop(self):
         """停止 WebSocket Handler"""
@@ -94,7 +103,7 @@ class WebSocketHandler:
         for search_session in self.search_sessions.values():  # ✅ 添加
             await search_session.cleanup()
             
-        print("✅ WebSocket Handler stopped")
+        logger.info("✅ WebSocket Handler stopped")
     
     # ==================== 数据监控 ====================
     
@@ -108,7 +117,7 @@ class WebSocketHandler:
         
         # 订阅 UI State 更新
         self.ui_state_manager.on_state_update(self._on_ui_state_update)
-        print("✅ UI State watcher initialized")
+        logger.info("✅ UI State watcher initialized")
     
     def _on_ui_state_update(self, state_id: str, data: Any):
         """
@@ -134,7 +143,7 @@ class WebSocketHandler:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"❌ Error in report watcher: {e}")
+                logger.error("❌ Error in report watcher: %s", e)
     
     async def _get_recent_reports(self, limit: int = 30) -> List[Dict[str, Any]]:
         """
@@ -164,44 +173,82 @@ class WebSocketHandler:
             
             return simplified
         except Exception as e:
-            print(f"❌ Error fetching recent reports: {e}")
+            logger.error("❌ Error fetching recent reports: %s", e)
             return []
     
+    async def _send_to_clients(self, message: str, clients: List[WSClient], what: str):
+        """
+        并发发送同一条已序列化的消息
+        
+        发送失败的连接视为已断开，立即从客户端列表移除，后续广播不再等待它
+        （Session 订阅等其余清理仍由 on_close 完成）
+        
+        Args:
+            message: 已序列化的消息文本
+            clients: 目标客户端（调用方传入快照，发送期间客户端列表可能变化）
+            what: 消息描述（用于错误日志）
+        """
+        if not clients:
+            return
+        
+        results = await asyncio.gather(
+            *(client.send_text(message) for client in clients),
+            return_exceptions=True
+        )
+        
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error("❌ Error sending %s: %s", what, result)
+                for cid, c in list(self.clients.items()):
+                    if c is client:
+                        del self.clients[cid]
+                        break
+    
     async def _broadcast_reports_update(self):
         """
         广播报告列表更新
         对应 TS: broadcastInboxUpdate (websocket-handler.ts 第 70-85 行)
         """
         reports = await self._get_recent_reports()
-        message = json.dumps({
+        message = _dumps({
             'type': 'reports_update',
             'reports': reports
-        }, ensure_ascii=False)
+        })
         
-        # 广播给所有客户端
-        for client in self.clients.values():
-            try:
-                await client.send_text(message)
-            except Exception as e:
-                print(f"❌ Error sending reports update: {e}")
+        # 并发广播给所有客户端
+        await self._send_to_clients(message, list(self.clients.values()), "reports update")
     
     async def _broadcast_ui_state_update(self, state_id: str, data: Any):
         """
         广播 UI State 更新
         对应 TS: broadcastUIStateUpdate (websocket-handler.ts 第 96-111 行)
         """
-        message = json.dumps({
+        message = _dumps({
             'type': 'ui_state_update',
             'stateId': state_id,
             'data': data
-        }, ensure_ascii=False)
+        })
         
-        # 广播给所有客户端
-        for client in self.clients.values():
-            try:
-                await client.send_text(message)
-            except Exception as e:
-                print(f"❌ Error sending UI state update: {e}")
+        # 并发广播给所有客户端
+        await self._send_to_clients(message, list(self.clients.values()), "UI state update")
+    
+    async def broadcast_listener_logs(self, logs: List[Dict[str, Any]]):
+        """
+        批量广播 Listener 执行日志
+        
+        Args:
+            logs: 日志条目列表（服务器按时间窗口合并后一次性推送）
+        """
+        if not self.clients:
+            return
+        
+        message = _dumps({
+            'type': 'listener_logs',
+            'logs': logs
+        })
+        
+        # 并发广播给所有客户端
+        await self._send_to_clients(message, list(self.clients.values()), "listener logs")
     
     async def _broadcast_report_analysis_update(self, report_id: str, title: str, analysis: Any, session_id: Optional[str] = None):
         """
@@ -225,23 +272,14 @@ class WebSocketHandler:
             'sessionId': message_obj.sessionId
         }
         
-        message = json.dumps(message_dict, ensure_ascii=False)
-        
-        # 广播给所有客户端或特定会话的客户端
-        for client in self.clients.values():
-            # 如果指定了session_id，只发送给该会话的客户端
-            if session_id:
-                if hasattr(client, 'session_id') and client.session_id == session_id:
-                    try:
-                        await client.send_text(message)
-                    except Exception as e:
-                        print(f"❌ Error sending report analysis update: {e}")
-            else:
-                # 否则发送给所有客户端
-                try:
-                    await client.send_text(message)
-                except Exception as e:
-                    print(f"❌ Error sending report analysis update: {e}")
+        message = _dumps(message_dict)
+        
+        # 广播给所有客户端或特定会话的客户端（指定 session_id 时只发送给该会话的客户端）
+        clients = [
+            client for client in self.clients.values()
+            if not session_id or getattr(client, 'session_id', None) == session_id
+        ]
+        await self._send_to_clients(message, clients, "report analysis update")
     
     async def _broadcast_alert_triggered(self, alert_id: str, title: str, message_text: str, severity: str = "info", data: Any = None, session_id: Optional[str] = None):
         """
@@ -269,23 +307,14 @@ class WebSocketHandler:
             'sessionId': message_obj.sessionId
         }
         
-        message = json.dumps(message_dict, ensure_ascii=False)
-        
-        # 广播给所有客户端或特定会话的客户端
-        for client in self.clients.values():
-            # 如果指定了session_id，只发送给该会话的客户端
-            if session_id:
-                if hasattr(client, 'session_id') and client.session_id == session_id:
-                    try:
-                        await client.send_text(message)
-                    except Exception as e:
-                        print(f"❌ Error sending alert triggered message: {e}")
-            else:
-                # 否则发送给所有客户端
-                try:
-                    await client.send_text(message)
-                except Exception as e:
-                    print(f"❌ Error sending alert triggered message: {e}")
+        message = _dumps(message_dict)
+        
+        # 广播给所有客户端或特定会话的客户端（指定 session_id 时只发送给该会话的客户端）
+        clients = [
+            client for client in self.clients.values()
+            if not session_id or getattr(client, 'session_id', None) == session_id
+        ]
+        await self._send_to_clients(message, clients, "alert triggered message")
     
     # ==================== Session 管理 ====================
     
@@ -328,7 +357,7 @@ class WebSocketHandler:
                 if not session.has_subscribers():
                     await session.cleanup()
                     del self.sessions[session_id]
-                    print(f"🗑️  Cleaned up empty session: {session_id}")
+                    logger.info("🗑️  Cleaned up empty session: %s", session_id)
     
     # ==================== WebSocket 事件处理 ====================
     
@@ -340,36 +369,36 @@ class WebSocketHandler:
         # 生成唯一的客户端 ID
         client_id = f"{int(time.time() * 1000)}-{hex(int(time.time() * 1000000) % 1000000)[2:]}"
         self.clients[client_id] = ws
-        print(f"🔌 WebSocket client connected: {client_id}")
+        logger.info("🔌 WebSocket client connected: %s", client_id)
         
         # 发送连接确认
-        await ws.send_text(json.dumps({
+        await ws.send_text(_dumps({
             'type': 'connected',
             'message': 'Connected to Finance Agent',
             'availableSessions': list(self.sessions.keys())
-        }, ensure_ascii=False))
+        }))
         
         # 发送初始报告列表
         reports = await self._get_recent_reports()
-        await ws.send_text(json.dumps({
+        await ws.send_text(_dumps({
             'type': 'reports_update',
             'reports': reports
-        }, ensure_ascii=False))
+        }))
         
         # 发送 UI State 模板列表
         if self.ui_state_manager:
             try:
                 ui_state_templates = self.ui_state_manager.get_all_templates()
-                await ws.send_text(json.dumps({
+                await ws.send_text(_dumps({
                     'type': 'ui_state_templates',
                     'templates': [{
                         'id': t.id,
                         'name': t.name,
                         'description': t.description
                     } for t in ui_state_templates]
-                }, ensure_ascii=False))
+                }))
             except Exception as e:
-                print(f"⚠️  Error sending UI state templates: {e}")
+                logger.warning("⚠️  Error sending UI state templates: %s", e)
     
     async def on_message(self, ws: WSClient, message: str):
         """
@@ -377,7 +406,7 @@ class WebSocketHandler:
         对应 TS: onMessage (websocket-handler.ts 第 191-340 行)
         """
         try:
-            data: IncomingMessage = json.loads(message)
+            data: IncomingMessage = orjson.loads(message)
             msg_type = data.get('type')
             
             if msg_type == 'chat':
@@ -402,17 +431,17 @@ class WebSocketHandler:
                 await self._handle_search_message(ws, data)
                 
             else:
-                await ws.send_text(json.dumps({
+                await ws.send_text(_dumps({
                     'type': 'error',
                     'error': f'Unknown message type: {msg_type}'
-                }, ensure_ascii=False))
+                }))
                 
         except Exception as e:
-            print(f"❌ WebSocket error: {e}")
-            await ws.send_text(json.dumps({
+            logger.error("❌ WebSocket error: %s", e)
+            await ws.send_text(_dumps({
                 'type': 'error',
                 'error': 'Failed to process message'
-            }, ensure_ascii=False))
+            }))
     
     async def on_close(self, ws: WSClient):
         """
@@ -430,7 +459,7 @@ class WebSocketHandler:
                 search_session = self.search_sessions[ws.session_id]
                 await search_session.cleanup()
                 del self.search_sessions[ws.session_id]
-                print(f"🗑️  Cleaned up search session: {ws.session_id}")
+                logger.info("🗑️  Cleaned up search session: %s", ws.session_id)
         
         # 从客户端列表中移除
         client_id = None
@@ -441,7 +470,7 @@ class WebSocketHandler:
         
         if client_id:
             del self.clients[client_id]
-            print(f"🔌 WebSocket client disconnected: {client_id}")
+            logger.info("🔌 WebSocket client disconnected: %s", client_id)
         
         # 清理空 Session
         asyncio.create_task(self._cleanup_empty_sessions())
@@ -479,10 +508,10 @@ class WebSocketHandler:
         session_id = data.get('sessionId')
         
         if not session_id:
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'error',
                 'error': 'Missing sessionId'
-            }, ensure_ascii=False))
+            }))
             return
         
         session = self.sessions.get(session_id)
@@ -495,15 +524,15 @@ class WebSocketHandler:
             
             # 订阅新 Session
             session.subscribe(ws)
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'subscribed',
                 'sessionId': session_id
-            }, ensure_ascii=False))
+            }))
         else:
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'error',
                 'error': 'Session not found'
-            }, ensure_ascii=False))
+            }))
     
     async def _handle_unsubscribe(self, ws: WSClient, data: IncomingMessage):
         """
@@ -519,10 +548,10 @@ class WebSocketHandler:
         if session:
             session.unsubscribe(ws)
             ws.session_id = None
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'unsubscribed',
                 'sessionId': session_id
-            }, ensure_ascii=False))
+            }))
     
     async def _handle_request_reports(self, ws: WSClient, data: IncomingMessage):
         """
@@ -530,10 +559,10 @@ class WebSocketHandler:
         对应 TS: case 'request_inbox' (websocket-handler.ts 第 253-261 行)
         """
         reports = await self._get_recent_reports()
-        await ws.send_text(json.dumps({
+        await ws.send_text(_dumps({
             'type': 'reports_update',
             'reports': reports
-        }, ensure_ascii=False))
+        }))
     
     async def _handle_subscribe_report_analysis(self, ws: WSClient, data: IncomingMessage):
         """
@@ -542,19 +571,19 @@ class WebSocketHandler:
         session_id = data.get('sessionId')
         
         if not session_id:
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'error',
                 'error': 'Missing sessionId for report analysis subscription'
-            }, ensure_ascii=False))
+            }))
             return
         
         # 这里可以添加特定于报告分析订阅的逻辑
         # 例如：将客户端添加到报告分析更新的订阅列表
-        await ws.send_text(json.dumps({
+        await ws.send_text(_dumps({
             'type': 'subscribed_report_analysis',
             'sessionId': session_id,
             'message': 'Successfully subscribed to report analysis updates'
-        }, ensure_ascii=False))
+        }))
     
     async def _handle_unsubscribe_report_analysis(self, ws: WSClient, data: IncomingMessage):
         """
@@ -566,11 +595,11 @@ class WebSocketHandler:
             return
         
         # 这里可以添加特定于报告分析取消订阅的逻辑
-        await ws.send_text(json.dumps({
+        await ws.send_text(_dumps({
             'type': 'unsubscribed_report_analysis',
             'sessionId': session_id,
             'message': 'Successfully unsubscribed from report analysis updates'
-        }, ensure_ascii=False))
+        }))
     
     # ==================== 公开方法 ====================
     
@@ -606,11 +635,11 @@ class WebSocketHandler:
         """
         # 检查 search_service 是否可用
         if not self.search_service:
-            await ws.send_text(json.dumps({
+            await ws.send_text(_dumps({
                 'type': 'search_error',
                 'error': 'Search service not available',
                 'message': '搜索服务未初始化'
-            }, ensure_ascii=False))
+            }))
             return
         
         try:
@@ -619,14 +648,14 @@ class WebSocketHandler:
             limit = data.get('limit', 10)
             
             if not query:
-                await ws.send_text(json.dumps({
+                await ws.send_text(_dumps({
                     'type': 'search_error',
                     'error': 'Query is required',
                     'message': '查询语句不能为空'
-                }, ensure_ascii=False))
+                }))
                 return
             
-            print(f"🔍 [WebSocketHandler] 接收搜索请求: {query} (session: {session_id})")
+            logger.debug("🔍 [WebSocketHandler] 接收搜索请求: %s (session: %s)", query, session_id)
             
             # 获取或创建搜索会话
             if session_id not in self.search_sessions:
@@ -642,23 +671,21 @@ class WebSocketHandler:
                     resume_id=resume_id  # 传递 resume_id
                 )
                 self.search_sessions[session_id] = search_session
-                print(f"🆕 [WebSocketHandler] 创建新搜索会话: {session_id} (resume: {resume_id})")
+                logger.debug("🆕 [WebSocketHandler] 创建新搜索会话: %s (resume: %s)", session_id, resume_id)
             else:
                 search_session = self.search_sessions[session_id]
-                print(f"♻️  [WebSocketHandler] 复用已有搜索会话: {session_id} (resume: {search_session.resume_id})")
+                logger.debug("♻️  [WebSocketHandler] 复用已有搜索会话: %s (resume: %s)", session_id, search_session.resume_id)
             
             # 处理查询
             await search_session.handle_query(query, limit)
             
         except Exception as e:
-            print(f"❌ [WebSocketHandler] 搜索消息处理失败: {e}")
-            import traceback
-            traceback.print_exc()
-            await ws.send_text(json.dumps({
+            logger.exception("❌ [WebSocketHandler] 搜索消息处理失败: %s", e)
+            await ws.send_text(_dumps({
                 'type': 'search_error',
                 'error': str(e),
                 'message': '搜索处理失败'
-            }, ensure_ascii=False))
+            }))
     
     async def cleanup(self):
         """清理所有资源"""
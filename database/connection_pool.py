@@ -0,0 +1,118 @@
+"""
+SQLite 异步连接池
+
+设计说明:
+- 读连接: 最多 size 个长连接复用（WAL 模式下读操作可并发）
+- 写连接: SQLite 单写者，写操作先拿全局写锁再取连接，避免 "database is locked"
+- size=0: 不做池化，每次操作独立连接（脚本/测试场景，无需显式关闭）
+- 每个新连接都会执行 CONNECTION_PRAGMAS（journal_mode=WAL 已在建库时持久化，无需重复）
+
+用法:
+    async with pool.acquire() as db:   # 只读查询
+        ...
+    async with pool.write() as db:     # 含 commit 的写操作
+        ...
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+import aiosqlite
+
+# 连接级 PRAGMA（不会持久化到数据库文件，每个新连接都要设置）
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",    # WAL 模式下 NORMAL 足够安全，减少 fsync
+    "PRAGMA temp_store = MEMORY",     # 临时表/排序使用内存
+    "PRAGMA mmap_size = 268435456",   # 256MB 内存映射读取
+    "PRAGMA cache_size = -65536",     # 64MB 页缓存（负数单位为 KB）
+)
+
+
+async def _configure(db: aiosqlite.Connection):
+    """为新连接应用 PRAGMA 调优"""
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+
+
+class SQLitePool:
+    """aiosqlite 连接池（读连接复用 + 写锁串行化）"""
+
+    def __init__(self, db_path: str, size: int = 0):
+        """
+        初始化连接池
+
+        Args:
+            db_path: 数据库文件路径
+            size: 最大连接数（0 表示不池化）
+        """
+        self.db_path = db_path
+        self.size = size
+        self._idle: List[aiosqlite.Connection] = []
+        # 同步原语在首次使用时创建，确保绑定到运行中的事件循环
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    def _ensure_primitives(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+            self._write_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        """不池化：独立连接，用完即关"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await _configure(db)
+            yield db
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """获取一个连接（只读查询使用）"""
+        if self.size <= 0:
+            async with self._connect() as db:
+                yield db
+            return
+
+        self._ensure_primitives()
+        async with self._slots:
+            db = self._idle.pop() if self._idle else await self._open()
+            try:
+                yield db
+            finally:
+                await self._release(db)
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """获取写连接（持有全局写锁，写操作串行执行）"""
+        if self.size <= 0:
+            async with self._connect() as db:
+                yield db
+            return
+
+        self._ensure_primitives()
+        async with self._write_lock:
+            async with self.acquire() as db:
+                yield db
+
+    async def _open(self) -> aiosqlite.Connection:
+        """新建池化连接"""
+        db = await aiosqlite.connect(self.db_path)
+        await _configure(db)
+        return db
+
+    async def _release(self, db: aiosqlite.Connection):
+        """归还连接：回滚未提交事务并恢复默认 row_factory，异常连接直接关闭"""
+        try:
+            if db.in_transaction:
+                await db.rollback()
+            db.row_factory = None
+        except Exception:
+            await db.close()
+            return
+        self._idle.append(db)
+
+    async def close(self):
+        """关闭所有空闲连接（服务器关闭时调用）"""
+        idle, self._idle = self._idle, []
+        for db in idle:
+            await db.close()
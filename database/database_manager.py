@@ -12,38 +12,45 @@ Finance Agent 数据库管理器
 - FTS5 全文搜索
 """
 
+import asyncio
+import logging
 import aiosqlite
 import sqlite3
 import json
 import os
+import orjson
 import chromadb
 from chromadb.utils import embedding_functions
 from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
-# 导入 Repository 层
+# 导入连接池和 Repository 层
+from .connection_pool import SQLitePool
 from .repositories import WatchlistRepository, PortfolioRepository, PrinciplesRepository
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseManager:
     """Finance Agent 数据库管理器 (异步)"""
     
     _instance = None  # 单例模式
     
-    def __new__(cls, db_path: str = "data/finance.db"):
+    def __new__(cls, db_path: str = "data/finance.db", pool_size: int = 0):
         """单例模式: 确保只有一个数据库连接实例"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
     
-    def __init__(self, db_path: str = "data/finance.db"):
+    def __init__(self, db_path: str = "data/finance.db", pool_size: int = 0):
         """
         初始化数据库管理器
         
         Args:
             db_path: 数据库文件路径
+            pool_size: 连接池大小（0 表示每次操作独立连接，适合脚本；服务器应设置为正数）
         """
         if self._initialized:
             return
@@ -56,14 +63,17 @@ class DatabaseManager:
         # 同步初始化数据库结构
         self._initialize_sync()
         
+        # 连接池（DatabaseManager 与各 Repository 共用）
+        self.pool = SQLitePool(db_path, size=pool_size)
+        
         # 初始化 Repository 层
-        self._watchlist_repo = WatchlistRepository(db_path)
-        self._portfolio_repo = PortfolioRepository(db_path)
-        self._principles_repo = PrinciplesRepository(db_path)
+        self._watchlist_repo = WatchlistRepository(db_path, pool=self.pool)
+        self._portfolio_repo = PortfolioRepository(db_path, pool=self.pool)
+        self._principles_repo = PrinciplesRepository(db_path, pool=self.pool)
         
         # 新增：ChromaDB 初始化（受环境变量控制）
         use_chromadb = os.getenv('USE_CHROMADB', 'false').lower() == 'true'
-        print(f"[DEBUG] USE_CHROMADB 环境变量: {use_chromadb}")
+        logger.debug("USE_CHROMADB 环境变量: %s", use_chromadb)
         if use_chromadb:
             self._init_chromadb()
         
@@ -89,9 +99,9 @@ class DatabaseManager:
             if schema_path.exists():
                 with open(schema_path, 'r', encoding='utf-8') as f:
                     conn.executescript(f.read())
-                print(f"✅ 数据库初始化成功: {self.db_path}")
+                logger.info("✅ 数据库初始化成功: %s", self.db_path)
             else:
-                print(f"⚠️ schema.sql 未找到: {schema_path}")
+                logger.warning("⚠️ schema.sql 未找到: %s", schema_path)
         
         finally:
             conn.close()
@@ -101,20 +111,20 @@ class DatabaseManager:
         try:
             # 初始化 ChromaDB 客户端
             chroma_db_path = os.getenv('CHROMA_DB_PATH', './chroma_db')
-            print(f"[DEBUG] ChromaDB 路径: {chroma_db_path}")
+            logger.debug("ChromaDB 路径: %s", chroma_db_path)
             self.chroma_client = chromadb.PersistentClient(path=chroma_db_path)
-            print("[DEBUG] ChromaDB 客户端创建成功")
+            logger.debug("ChromaDB 客户端创建成功")
             
             # 尝试使用 SentenceTransformer 嵌入函数
             try:
                 embedding_model = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-                print(f"[DEBUG] 嵌入模型: {embedding_model}")
+                logger.debug("嵌入模型: %s", embedding_model)
                 self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
                     model_name=embedding_model
                 )
-                print("[DEBUG] SentenceTransformer 嵌入函数创建成功")
+                logger.debug("SentenceTransformer 嵌入函数创建成功")
             except Exception as embed_error:
-                print(f"⚠️  SentenceTransformer 嵌入函数不可用: {embed_error}")
+                logger.warning("⚠️  SentenceTransformer 嵌入函数不可用: %s", embed_error)
                 # 使用默认嵌入函数
                 self.embedding_function = None
             
@@ -133,17 +143,15 @@ class DatabaseManager:
                     name=collection_name,
                     embedding_function=self.embedding_function
                 )
-                print(f"[DEBUG] 成功获取已存在的集合 {collection_name}")
+                logger.debug("成功获取已存在的集合 %s", collection_name)
             except:
                 # 如果获取失败（集合不存在或配置不匹配），则创建新集合
-                print(f"[DEBUG] 集合 {collection_name} 不存在或配置不匹配，创建新集合")
+                logger.debug("集合 %s 不存在或配置不匹配，创建新集合", collection_name)
                 self.reports_collection = self.chroma_client.create_collection(**collection_args)
             
-            print("✅ ChromaDB 初始化成功")
+            logger.info("✅ ChromaDB 初始化成功")
         except Exception as e:
-            print(f"❌ ChromaDB 初始化失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ ChromaDB 初始化失败: %s", e)
             self.chroma_client = None
     
     # ============================================================================
@@ -170,13 +178,13 @@ class DatabaseManager:
         Returns:
             int: 报告的自增 ID
         """
-        # JSON 字段序列化
+        # JSON 字段序列化（orjson 输出 UTF-8，与 ensure_ascii=False 一致，以 TEXT 存储）
         json_fields = ['analysis_json', 'sources', 'key_drivers']
         for key in json_fields:
             if key in report_data and isinstance(report_data[key], (dict, list)):
-                report_data[key] = json.dumps(report_data[key], ensure_ascii=False)
+                report_data[key] = orjson.dumps(report_data[key]).decode()
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             cursor = await db.execute("""
                 INSERT INTO reports (
                     report_id, title, report_type, category, date_published, sources,
@@ -212,34 +220,33 @@ class DatabaseManager:
             """, report_data)
             
             await db.commit()
-            
-            # 新增：如果启用了 ChromaDB，同时保存到向量数据库
-            print(f"[DEBUG] 检查 ChromaDB 是否可用: hasattr={hasattr(self, 'chroma_client')}, chroma_client={getattr(self, 'chroma_client', 'NOT_SET')}")
-            if hasattr(self, 'chroma_client') and self.chroma_client:
-                try:
-                    print(f"[DEBUG] 正在保存到 ChromaDB: {report_data.get('report_id')}")
-                    await self._save_to_chromadb(report_data)
-                    print(f"[DEBUG] 成功保存到 ChromaDB: {report_data.get('report_id')}")
-                except Exception as e:
-                    print(f"⚠️  保存到 ChromaDB 失败: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            return cursor.lastrowid
+            row_id = cursor.lastrowid
+        
+        # 新增：如果启用了 ChromaDB，同时保存到向量数据库（已释放写锁，嵌入计算不阻塞其他写操作）
+        logger.debug("检查 ChromaDB 是否可用: hasattr=%s, chroma_client=%s", hasattr(self, 'chroma_client'), getattr(self, 'chroma_client', 'NOT_SET'))
+        if hasattr(self, 'chroma_client') and self.chroma_client:
+            try:
+                logger.debug("正在保存到 ChromaDB: %s", report_data.get('report_id'))
+                await self._save_to_chromadb(report_data)
+                logger.debug("成功保存到 ChromaDB: %s", report_data.get('report_id'))
+            except Exception as e:
+                logger.warning("⚠️  保存到 ChromaDB 失败: %s", e, exc_info=True)
+        
+        return row_id
     
     async def _save_to_chromadb(self, report_data):
         """保存报告到 ChromaDB"""
-        print(f"[DEBUG] [数据库管理器] [_save_to_chromadb] 开始保存报告到ChromaDB, report_id={report_data['report_id']}, title='{report_data.get('title', 'N/A')}'")
+        logger.debug("[数据库管理器] [_save_to_chromadb] 开始保存报告到ChromaDB, report_id=%s, title='%s'", report_data['report_id'], report_data.get('title', 'N/A'))
         
         # 构建用于向量搜索的合成语义文本
         from .relationship_analyzer import ReportRelationshipAnalyzer
         analyzer = ReportRelationshipAnalyzer(self)
         embedding_text = analyzer._prepare_embedding_text(report_data)
-        print(f"[DEBUG] [数据库管理器] [_save_to_chromadb] 合成语义文本长度: {len(embedding_text)}")
+        logger.debug("[数据库管理器] [_save_to_chromadb] 合成语义文本长度: %s", len(embedding_text))
         
         # 使用合成语义文本作为文档内容，以便更好地进行语义搜索
         documents = [embedding_text]
-        print(f"[DEBUG] [数据库管理器] [_save_to_chromadb] 文档内容长度: {len(documents[0]) if documents[0] else 0}")
+        logger.debug("[数据库管理器] [_save_to_chromadb] 文档内容长度: %s", len(documents[0]) if documents[0] else 0)
         
         metadatas = [{
             "report_id": report_data['report_id'],
@@ -254,15 +261,17 @@ class DatabaseManager:
         }]
         ids = [report_data['report_id']]
         
-        print(f"[DEBUG] [数据库管理器] [_save_to_chromadb] 准备执行upsert操作")
+        logger.debug("[数据库管理器] [_save_to_chromadb] 准备执行upsert操作")
     
-        self.reports_collection.upsert(
+        # ChromaDB 客户端是同步的（含嵌入计算），放到线程中执行，避免阻塞事件循环
+        await asyncio.to_thread(
+            self.reports_collection.upsert,
             documents=documents,  # 使用合成语义文本
             metadatas=metadatas,
             ids=ids
         )
         
-        print(f"[INFO] [数据库管理器] [_save_to_chromadb] 成功保存报告到ChromaDB, report_id={report_data['report_id']}")
+        logger.info("[数据库管理器] [_save_to_chromadb] 成功保存报告到ChromaDB, report_id=%s", report_data['report_id'])
     
     async def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -274,7 +283,7 @@ class DatabaseManager:
         Returns:
             Dict: 报告数据 (JSON 字段已反序列化)
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM reports WHERE report_id = ?",
@@ -295,6 +304,24 @@ class DatabaseManager:
             
             return None
     
+    async def get_report_analysis_raw(self, report_id: str) -> Optional[str]:
+        """
+        只读取报告的 analysis_json 原文（不取 content 等大字段，也不做反序列化）
+        
+        Args:
+            report_id: 报告唯一标识
+        
+        Returns:
+            str: analysis_json 原始 JSON 文本（字段为空时返回空字符串）；报告不存在返回 None
+        """
+        async with self.pool.acquire() as db:
+            cursor = await db.execute(
+                "SELECT COALESCE(analysis_json, '') FROM reports WHERE report_id = ?",
+                (report_id,)
+            )
+            row = await cursor.fetchone()
+            return row[0] if row else None
+    
     async def search_reports(
         self,
         query: Optional[str] = None,
@@ -381,16 +408,16 @@ class DatabaseManager:
         params['offset'] = offset
         
         # 添加调试信息
-        print(f"[DEBUG] 执行查询: {query_sql}")
-        print(f"[DEBUG] 查询参数: {params}")
+        logger.debug("执行查询: %s", query_sql)
+        logger.debug("查询参数: %s", params)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(query_sql, params)
             rows = await cursor.fetchall()
             
             # 添加调试信息
-            print(f"[DEBUG] 查询返回 {len(rows)} 条记录")
+            logger.debug("查询返回 %s 条记录", len(rows))
             
             results = []
             for row in rows:
@@ -440,22 +467,23 @@ class DatabaseManager:
         # 1. 如果只有语义搜索（无结构化筛选条件）
         if query and not (category or action or min_importance):
             # 不需要构建where条件，因为没有结构化筛选条件
-            print(f"[DEBUG] [数据库管理器] [_chroma_search_reports] 执行纯向量搜索, query={query}, limit={limit}")
+            logger.debug("[数据库管理器] [_chroma_search_reports] 执行纯向量搜索, query=%s, limit=%s", query, limit)
             
             # 确保查询文本不为空
             if not query.strip():
-                print("[DEBUG] 查询文本为空，返回空结果")
+                logger.debug("查询文本为空，返回空结果")
                 return []
                 
             # 获取比请求更多的结果，以便过滤距离
-            results = self.reports_collection.query(
+            results = await asyncio.to_thread(
+                self.reports_collection.query,
                 query_texts=[query],
                 n_results=limit * 3  # 获取更多结果以允许过滤
             )
             
             # 检查是否返回了结果
             if not results['ids'] or len(results['ids'][0]) == 0:
-                print("[DEBUG] 未找到任何匹配结果")
+                logger.debug("未找到任何匹配结果")
                 return []
             
             # 从返回的 metadata 中构建报告信息，只包括距离小于0.5的结果
@@ -484,7 +512,7 @@ class DatabaseManager:
                     'similarity_distance': results['distances'][0][i] if 'distances' in results and i < len(results['distances'][0]) else None
                 })
             
-            print(f"[DEBUG] [数据库管理器] [_chroma_search_reports] 过滤后返回 {len(reports)} 个高相似度结果")
+            logger.debug("[数据库管理器] [_chroma_search_reports] 过滤后返回 %s 个高相似度结果", len(reports))
             return reports
         
         # 2. 如果有结构化筛选条件，需要混合搜索
@@ -497,10 +525,11 @@ class DatabaseManager:
                 where_conditions["action"] = action
             if min_importance is not None:
                 where_conditions["importance_score"] = {"$gte": min_importance}
-            print(f"[DEBUG] [混合搜索] [_chroma_search_reports] 执行向量搜索, query={query}, where_conditions={where_conditions}, limit={limit}")
+            logger.debug("[混合搜索] [_chroma_search_reports] 执行向量搜索, query=%s, where_conditions=%s, limit=%s", query, where_conditions, limit)
             if query:
                 # 获取更多结果用于距离过滤
-                chroma_results = self.reports_collection.query(
+                chroma_results = await asyncio.to_thread(
+                    self.reports_collection.query,
                     query_texts=[query],
                     where=where_conditions if where_conditions else None,
                     n_results=limit * 3  # 获取更多结果以允许距离过滤
@@ -521,7 +550,10 @@ class DatabaseManager:
                 candidate_ids = filtered_candidate_ids[:limit]  # 限制返回数量
             else:
                 # 如果没有语义搜索，获取所有候选文档
-                all_docs = self.reports_collection.get(where=where_conditions if where_conditions else None)
+                all_docs = await asyncio.to_thread(
+                    self.reports_collection.get,
+                    where=where_conditions if where_conditions else None
+                )
                 candidate_ids = all_docs['ids']
             
             # 再用 SQLite 进行结构化筛选
@@ -557,7 +589,7 @@ class DatabaseManager:
             params.append(offset)
             
             # 执行 SQLite 查询
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.acquire() as db:
                 db.row_factory = aiosqlite.Row
                 cursor = await db.execute(sql, params)
                 rows = await cursor.fetchall()
@@ -586,7 +618,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 报告列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT report_id, title, category, date_published, content, summary_one_sentence
@@ -596,7 +628,7 @@ class DatabaseManager:
             """, (limit,))
             rows = await cursor.fetchall()
             
-            print(f"[DEBUG] 列出所有报告，返回 {len(rows)} 条记录")
+            logger.debug("列出所有报告，返回 %s 条记录", len(rows))
             
             results = []
             for row in rows:
@@ -616,7 +648,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 高优先级报告列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM high_priority_reports LIMIT ?",
@@ -641,7 +673,7 @@ class DatabaseManager:
         Returns:
             Dict: 状态数据 (已反序列化)
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             cursor = await db.execute(
                 "SELECT data_json FROM ui_states WHERE state_id = ?",
                 (state_id,)
@@ -668,7 +700,7 @@ class DatabaseManager:
         """
         data_json = json.dumps(data, ensure_ascii=False)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute("""
                 INSERT INTO ui_states (state_id, data_json)
                 VALUES (?, ?)
@@ -680,7 +712,7 @@ class DatabaseManager:
     
     async def delete_ui_state(self, state_id: str) -> None:
         """删除 UI 状态"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute("DELETE FROM ui_states WHERE state_id = ?", (state_id,))
             await db.commit()
     
@@ -707,7 +739,7 @@ class DatabaseManager:
         Returns:
             int: 自增 ID
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             cursor = await db.execute("""
                 INSERT INTO component_instances (instance_id, component_id, state_id, session_id)
                 VALUES (?, ?, ?, ?)
@@ -728,7 +760,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 组件实例列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM component_instances WHERE session_id = ? ORDER BY created_at DESC",
@@ -753,7 +785,7 @@ class DatabaseManager:
                 'avg_importance': 平均重要性评分
             }
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             # 总报告数
             cursor = await db.execute("SELECT COUNT(*) FROM reports")
             total_reports = (await cursor.fetchone())[0]
@@ -841,7 +873,7 @@ class DatabaseManager:
         """
         json_data = json.dumps(data, ensure_ascii=False)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute("""
                 INSERT INTO ui_states (state_id, data_json)
                 VALUES (?, ?)
@@ -861,7 +893,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: [{'stateId': '...', 'updatedAt': '...'}]
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT state_id as stateId, updated_at as updatedAt
@@ -880,7 +912,7 @@ class DatabaseManager:
         Args:
             state_id: 状态 ID
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 "DELETE FROM ui_states WHERE state_id = ?",
                 (state_id,)
@@ -893,7 +925,7 @@ class DatabaseManager:
     
     async def execute_raw_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
-        执行原始 SQL 查询
+        执行原始 SQL 查询（只读，走读连接；DDL/写操作请使用 execute_raw_command）
         
         Args:
             query: SQL 查询语句
@@ -902,7 +934,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 查询结果
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(query, params)
             rows = await cursor.fetchall()
@@ -919,16 +951,21 @@ class DatabaseManager:
         Returns:
             int: 受影响的行数
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             cursor = await db.execute(query, params)
             await db.commit()
             return cursor.rowcount
     
     def close(self):
         """关闭数据库连接 (单例模式下通常不需要显式调用)"""
-        # aiosqlite 使用 async with 自动管理连接,无需手动关闭
+        # 未池化时 aiosqlite 使用 async with 自动管理连接,无需手动关闭
+        # 池化连接请在事件循环内调用 aclose()
         pass
     
+    async def aclose(self):
+        """关闭连接池中的长连接（服务器关闭时调用）"""
+        await self.pool.close()
+    
     # ============================================================================
     # Repository 层访问属性
     # ============================================================================
@@ -992,7 +1029,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 搜索结果
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             # 直接查询FTS5表
             cursor = await db.execute("""
@@ -1001,7 +1038,7 @@ class DatabaseManager:
             """, (query,))
             rows = await cursor.fetchall()
             
-            print(f"[DEBUG] FTS5搜索 '{query}' 返回 {len(rows)} 条记录")
+            logger.debug("FTS5搜索 '%s' 返回 %s 条记录", query, len(rows))
             
             results = []
             for row in rows:
@@ -1019,7 +1056,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 关联关系列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT * FROM report_relationships
@@ -1051,7 +1088,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 关联关系列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT * FROM report_relationships
@@ -1084,7 +1121,7 @@ class DatabaseManager:
         Returns:
             int: 删除的记录数
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             if source_report_id and target_report_id:
                 # 删除特定的关联关系
                 cursor = await db.execute("""
@@ -1119,7 +1156,7 @@ class DatabaseManager:
         Returns:
             List[Dict]: 所有关联关系列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT * FROM report_relationships
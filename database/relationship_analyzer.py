@@ -4,6 +4,7 @@
 """
 
 import json
+import logging
 import asyncio
 import re
 from typing import Dict, List, Optional, Any
@@ -12,6 +13,8 @@ from pathlib import Path
 # 项目内部导入
 from .database_manager import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 
 class ReportRelationshipAnalyzer:
     """报告关联性分析器"""
@@ -45,7 +48,7 @@ class ReportRelationshipAnalyzer:
                 loop.run_until_complete(self._initialize_relationships_table())
             else:
                 # 在非主线程中，简单记录日志
-                print(f"[WARNING] [关系分析器] [__init__] 无法在当前上下文中初始化关联关系表")
+                logger.warning("[关系分析器] [__init__] 无法在当前上下文中初始化关联关系表")
     
     async def _initialize_relationships_table(self):
         """
@@ -65,7 +68,7 @@ class ReportRelationshipAnalyzer:
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
             """
-            await self.db.execute_raw_query(create_table_sql)
+            await self.db.execute_raw_command(create_table_sql)
             
             # 创建索引以提高查询性能
             index_queries = [
@@ -78,16 +81,14 @@ class ReportRelationshipAnalyzer:
             
             for sql in index_queries:
                 try:
-                    await self.db.execute_raw_query(sql)
+                    await self.db.execute_raw_command(sql)
                 except Exception as e:
                     # 索引创建失败通常不影响功能，只记录日志
-                    print(f"[WARNING] [关系分析器] [_initialize_relationships_table] 创建索引失败: {e}")
+                    logger.warning("[关系分析器] [_initialize_relationships_table] 创建索引失败: %s", e)
             
-            print(f"[INFO] [关系分析器] [_initialize_relationships_table] 关联关系表初始化完成")
+            logger.info("[关系分析器] [_initialize_relationships_table] 关联关系表初始化完成")
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [_initialize_relationships_table] 初始化关联关系表失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [_initialize_relationships_table] 初始化关联关系表失败: %s", e)
     
     def _prepare_embedding_text(self, report_data: Dict[str, Any]) -> str:
         """
@@ -99,16 +100,16 @@ class ReportRelationshipAnalyzer:
         Returns:
             str: 合成语义文本
         """
-        print(f"[DEBUG] [关系分析器] [_prepare_embedding_text] 开始构建合成语义文本, report_id={report_data.get('report_id', 'N/A')}")
+        logger.debug("[关系分析器] [_prepare_embedding_text] 开始构建合成语义文本, report_id=%s", report_data.get('report_id', 'N/A'))
         
         # 解析JSON数据
         analysis_json = report_data.get('analysis_json', {})
         if isinstance(analysis_json, str):
             try:
-                print(f"[DEBUG] [关系分析器] [_prepare_embedding_text] 解析analysis_json字符串")
+                logger.debug("[关系分析器] [_prepare_embedding_text] 解析analysis_json字符串")
                 analysis_json = json.loads(analysis_json)
             except json.JSONDecodeError:
-                print(f"[WARNING] [关系分析器] [_prepare_embedding_text] analysis_json解析失败，使用空字典")
+                logger.warning("[关系分析器] [_prepare_embedding_text] analysis_json解析失败，使用空字典")
                 analysis_json = {}
         
         report_info = analysis_json.get('report_info', {})
@@ -126,7 +127,7 @@ class ReportRelationshipAnalyzer:
         action = analysis_json.get('investment_advice', {}).get('action', '')
         holding_period = analysis_json.get('investment_advice', {}).get('holding_period', '')
         
-        print(f"[DEBUG] [关系分析器] [_prepare_embedding_text] 构建文本字段 - 标题: {title[:50]}..., 分类: {category}, 摘要: {one_sentence[:30]}...")
+        logger.debug("[关系分析器] [_prepare_embedding_text] 构建文本字段 - 标题: %s..., 分类: %s, 摘要: %s...", title[:50], category, one_sentence[:30])
         
         embedding_text = f"""
 标题: {title}
@@ -139,7 +140,7 @@ class ReportRelationshipAnalyzer:
 时间范围: {holding_period}
 """
         
-        print(f"[DEBUG] [关系分析器] [_prepare_embedding_text] 合成语义文本构建完成, 长度={len(embedding_text)}")
+        logger.debug("[关系分析器] [_prepare_embedding_text] 合成语义文本构建完成, 长度=%s", len(embedding_text))
         return embedding_text.strip()
     
     async def find_related_reports(self, new_report_id: str, max_results: int = 10) -> List[Dict[str, Any]]:
@@ -153,45 +154,45 @@ class ReportRelationshipAnalyzer:
         Returns:
             List[Dict]: 关联报告列表
         """
-        print(f"[DEBUG] [关系分析器] [find_related_reports] 开始查找关联报告, new_report_id={new_report_id}, max_results={max_results}")
+        logger.debug("[关系分析器] [find_related_reports] 开始查找关联报告, new_report_id=%s, max_results=%s", new_report_id, max_results)
         
         if not self.chroma_client or not self.reports_collection:
-            print("[警告] [关系分析器] [find_related_reports] ChromaDB未启用，无法进行关联分析")
+            logger.warning("[关系分析器] [find_related_reports] ChromaDB未启用，无法进行关联分析")
             return []
         
         try:
             # 获取新报告
-            print(f"[DEBUG] [关系分析器] [find_related_reports] 正在获取新报告 {new_report_id}")
+            logger.debug("[关系分析器] [find_related_reports] 正在获取新报告 %s", new_report_id)
             new_report = await self.db.get_report(new_report_id)
             if not new_report:
-                print(f"[警告] [关系分析器] [find_related_reports] 未找到报告 {new_report_id}")
+                logger.warning("[关系分析器] [find_related_reports] 未找到报告 %s", new_report_id)
                 return []
             
-            print(f"[DEBUG] [关系分析器] [find_related_reports] 成功获取报告数据, title='{new_report.get('title', 'N/A')}', category='{new_report.get('category', 'N/A')}'")
+            logger.debug("[关系分析器] [find_related_reports] 成功获取报告数据, title='%s', category='%s'", new_report.get('title', 'N/A'), new_report.get('category', 'N/A'))
             
             # 构建新报告的embedding文本
             query_text = self._prepare_embedding_text(new_report)
-            print(f"[DEBUG] [关系分析器] [find_related_reports] 构建embedding文本完成, 长度={len(query_text)}")
+            logger.debug("[关系分析器] [find_related_reports] 构建embedding文本完成, 长度=%s", len(query_text))
             
             # 使用metadata过滤排除自身报告
             where_conditions = {
                 "report_id": {"$ne": new_report_id}  # 排除自身
             }
             
-            print(f"[DEBUG] [关系分析器] [find_related_reports] 开始执行向量搜索")
+            logger.debug("[关系分析器] [find_related_reports] 开始执行向量搜索")
             # 执行向量搜索，不限制分类，让语义匹配决定相关性
             results = self.reports_collection.query(
                 query_texts=[query_text],
                 where=where_conditions,
                 n_results=max_results
             )
-            print(f"[DEBUG] [关系分析器] [find_related_reports] 向量搜索完成, 找到 {len(results['ids'][0])} 个结果")
+            logger.debug("[关系分析器] [find_related_reports] 向量搜索完成, 找到 %s 个结果", len(results['ids'][0]))
             
             # 处理结果
             related_reports = []
             for i, doc_id in enumerate(results['ids'][0]):
                 if i >= max_results:
-                    print(f"[DEBUG] [关系分析器] [find_related_reports] 达到最大结果数限制，停止处理")
+                    logger.debug("[关系分析器] [find_related_reports] 达到最大结果数限制，停止处理")
                     break
                     
                 # 获取相似度得分
@@ -199,7 +200,7 @@ class ReportRelationshipAnalyzer:
                 
                 # 只有距离小于0.6的报告才被认为是相关的
                 if distance >= 0.6:
-                    print(f"[DEBUG] [关系分析器] [find_related_reports] 距离 {distance} >= 0.6，跳过此结果")
+                    logger.debug("[关系分析器] [find_related_reports] 距离 %s >= 0.6，跳过此结果", distance)
                     continue
                 
                 # 转换为相似度得分（0-100，越大越相似）
@@ -217,13 +218,11 @@ class ReportRelationshipAnalyzer:
             # 按相似度排序
             related_reports.sort(key=lambda x: x['similarity_score'], reverse=True)
             
-            print(f"[INFO] [关系分析器] [find_related_reports] 成功找到 {len(related_reports)} 个关联报告")
+            logger.info("[关系分析器] [find_related_reports] 成功找到 %s 个关联报告", len(related_reports))
             return related_reports
             
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [find_related_reports] 查找关联报告失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [find_related_reports] 查找关联报告失败: %s", e)
             return []
     
     def _build_relationship_analysis_prompt(self, new_report: Dict[str, Any], 
@@ -238,23 +237,23 @@ class ReportRelationshipAnalyzer:
         Returns:
             str: Prompt文本
         """
-        print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] 开始构建关联性分析Prompt, 新报告ID={new_report.get('report_id', 'N/A')}, 历史报告数量={len(historical_reports)}")
+        logger.debug("[关系分析器] [_build_relationship_analysis_prompt] 开始构建关联性分析Prompt, 新报告ID=%s, 历史报告数量=%s", new_report.get('report_id', 'N/A'), len(historical_reports))
         
         # 准备新报告JSON
         new_report_json = new_report.get('analysis_json', {})
         if isinstance(new_report_json, str):
             try:
-                print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] 解析新报告JSON")
+                logger.debug("[关系分析器] [_build_relationship_analysis_prompt] 解析新报告JSON")
                 new_report_json = json.loads(new_report_json)
             except json.JSONDecodeError:
-                print(f"[WARNING] [关系分析器] [_build_relationship_analysis_prompt] 新报告JSON解析失败，使用空字典")
+                logger.warning("[关系分析器] [_build_relationship_analysis_prompt] 新报告JSON解析失败，使用空字典")
                 new_report_json = {}
         
         # 准备历史报告摘要
         historical_summaries = []
-        print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] 开始处理 {len(historical_reports)} 个历史报告")
+        logger.debug("[关系分析器] [_build_relationship_analysis_prompt] 开始处理 %s 个历史报告", len(historical_reports))
         for i, report in enumerate(historical_reports):
-            print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] 处理历史报告 {i+1}/{len(historical_reports)}, ID={report['report_id']}")
+            logger.debug("[关系分析器] [_build_relationship_analysis_prompt] 处理历史报告 %s/%s, ID=%s", i+1, len(historical_reports), report['report_id'])
             report_json = report.get('analysis_json', {})
             if isinstance(report_json, str):
                 try:
@@ -280,7 +279,7 @@ class ReportRelationshipAnalyzer:
             }
             historical_summaries.append(summary)
         
-        print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] 历史报告摘要构建完成")
+        logger.debug("[关系分析器] [_build_relationship_analysis_prompt] 历史报告摘要构建完成")
         
         prompt = f"""
 你是一个金融投资研报分析专家。你的任务是分析一份"新报告"与"历史报告列表"之间的逻辑关联。
@@ -314,7 +313,7 @@ class ReportRelationshipAnalyzer:
 }}
 """
         
-        print(f"[DEBUG] [关系分析器] [_build_relationship_analysis_prompt] Prompt构建完成, 长度={len(prompt)}")
+        logger.debug("[关系分析器] [_build_relationship_analysis_prompt] Prompt构建完成, 长度=%s", len(prompt))
         return prompt
     
     async def analyze_report_relationships(self, new_report_id: str, max_candidates: int = 5) -> Dict[str, Any]:
@@ -328,50 +327,50 @@ class ReportRelationshipAnalyzer:
         Returns:
             Dict: 关联分析结果
         """
-        print(f"[INFO] [关系分析器] [analyze_report_relationships] 开始分析报告 {new_report_id} 的关联关系, max_candidates={max_candidates}")
+        logger.info("[关系分析器] [analyze_report_relationships] 开始分析报告 %s 的关联关系, max_candidates=%s", new_report_id, max_candidates)
         
         # 1. 查找候选关联报告
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤1: 查找候选关联报告")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤1: 查找候选关联报告")
         candidate_results = await self.find_related_reports(new_report_id, max_candidates)
         if not candidate_results:
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 未找到候选关联报告")
+            logger.debug("[关系分析器] [analyze_report_relationships] 未找到候选关联报告")
             return {"relations": []}
         else:
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 找到 {len(candidate_results)} 个候选关联报告")
+            logger.debug("[关系分析器] [analyze_report_relationships] 找到 %s 个候选关联报告", len(candidate_results))
         
         # 2. 获取新报告完整数据
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤2: 获取新报告完整数据")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤2: 获取新报告完整数据")
         new_report = await self.db.get_report(new_report_id)
         if not new_report:
-            print(f"[ERROR] [关系分析器] [analyze_report_relationships] 无法获取新报告 {new_report_id}")
+            logger.error("[关系分析器] [analyze_report_relationships] 无法获取新报告 %s", new_report_id)
             return {"relations": []}
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 成功获取新报告数据")
+        logger.debug("[关系分析器] [analyze_report_relationships] 成功获取新报告数据")
         
         # 3. 获取历史报告数据列表
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤3: 获取历史报告数据列表")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤3: 获取历史报告数据列表")
         historical_reports = []
         for i, relation in enumerate(candidate_results):
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 获取历史报告 {relation['related_report_id']}, 进度 {i+1}/{len(candidate_results)}")
+            logger.debug("[关系分析器] [analyze_report_relationships] 获取历史报告 %s, 进度 %s/%s", relation['related_report_id'], i+1, len(candidate_results))
             report_data = await self.db.get_report(relation['related_report_id'])
             if report_data:
-                print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 成功获取历史报告 {relation['related_report_id']}, title='{report_data.get('title', 'N/A')}'")
+                logger.debug("[关系分析器] [analyze_report_relationships] 成功获取历史报告 %s, title='%s'", relation['related_report_id'], report_data.get('title', 'N/A'))
                 historical_reports.append(report_data)
             else:
-                print(f"[WARNING] [关系分析器] [analyze_report_relationships] 无法获取历史报告 {relation['related_report_id']}")
+                logger.warning("[关系分析器] [analyze_report_relationships] 无法获取历史报告 %s", relation['related_report_id'])
         
         if not historical_reports:
-            print(f"[WARNING] [关系分析器] [analyze_report_relationships] 未获取到任何历史报告数据")
+            logger.warning("[关系分析器] [analyze_report_relationships] 未获取到任何历史报告数据")
             return {"relations": []}
         else:
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 成功获取 {len(historical_reports)} 个历史报告数据")
+            logger.debug("[关系分析器] [analyze_report_relationships] 成功获取 %s 个历史报告数据", len(historical_reports))
         
         # 4. 构建分析Prompt
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤4: 构建分析Prompt")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤4: 构建分析Prompt")
         prompt = self._build_relationship_analysis_prompt(new_report, historical_reports)
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] Prompt构建完成, 长度={len(prompt)}")
+        logger.debug("[关系分析器] [analyze_report_relationships] Prompt构建完成, 长度=%s", len(prompt))
         
         # 5. 调用LLM进行深度分析
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤5: 调用LLM进行深度分析")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤5: 调用LLM进行深度分析")
         try:
             # 初始化AI客户端
             import sys
@@ -380,13 +379,13 @@ class ReportRelationshipAnalyzer:
             from ccsdk.ai_client import AIClient
             
             # 创建AI客户端实例
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 初始化AI客户端")
+            logger.debug("[关系分析器] [analyze_report_relationships] 初始化AI客户端")
             ai_client = AIClient()
             
             # 执行LLM查询
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 执行LLM查询")
+            logger.debug("[关系分析器] [analyze_report_relationships] 执行LLM查询")
             result = await ai_client.query_single(prompt)
-            print(f"[DEBUG] [关系分析器] [analyze_report_relationships] LLM查询完成, 共收到 {len(result['messages'])} 条消息")
+            logger.debug("[关系分析器] [analyze_report_relationships] LLM查询完成, 共收到 %s 条消息", len(result['messages']))
             
             # 提取AI响应内容
             assistant_message = None
@@ -422,25 +421,23 @@ class ReportRelationshipAnalyzer:
                         # 提取relations部分
                         relations = llm_result.get('relations', [])
                         
-                        print(f"[INFO] [关系分析器] [analyze_report_relationships] LLM分析完成，找到 {len(relations)} 个关联关系")
+                        logger.info("[关系分析器] [analyze_report_relationships] LLM分析完成，找到 %s 个关联关系", len(relations))
                     except json.JSONDecodeError as e:
-                        print(f"[ERROR] [关系分析器] [analyze_report_relationships] 解析LLM返回的JSON失败: {e}")
-                        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] LLM返回内容: {json_str[:500]}...")
+                        logger.error("[关系分析器] [analyze_report_relationships] 解析LLM返回的JSON失败: %s", e)
+                        logger.debug("[关系分析器] [analyze_report_relationships] LLM返回内容: %s...", json_str[:500])
                         # 如果解析失败，使用基于相似度的模拟结果
                         relations = self._generate_fallback_relations(candidate_results, historical_reports)
                 else:
-                    print(f"[WARNING] [关系分析器] [analyze_report_relationships] 未在LLM响应中找到JSON格式结果")
+                    logger.warning("[关系分析器] [analyze_report_relationships] 未在LLM响应中找到JSON格式结果")
                     # 如果没有找到JSON，使用基于相似度的模拟结果
                     relations = self._generate_fallback_relations(candidate_results, historical_reports)
             else:
-                print(f"[WARNING] [关系分析器] [analyze_report_relationships] LLM未返回有效内容，使用模拟结果")
+                logger.warning("[关系分析器] [analyze_report_relationships] LLM未返回有效内容，使用模拟结果")
                 # 如果没有有效响应，使用基于相似度的模拟结果
                 relations = self._generate_fallback_relations(candidate_results, historical_reports)
         
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [analyze_report_relationships] LLM调用失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [analyze_report_relationships] LLM调用失败: %s", e)
             
             # 如果LLM调用失败，使用基于相似度的模拟结果
             relations = self._generate_fallback_relations(candidate_results, historical_reports)
@@ -448,10 +445,10 @@ class ReportRelationshipAnalyzer:
         result = {"relations": relations}
         
         # 6. 存储分析结果到数据库
-        print(f"[DEBUG] [关系分析器] [analyze_report_relationships] 步骤6: 存储分析结果到数据库")
+        logger.debug("[关系分析器] [analyze_report_relationships] 步骤6: 存储分析结果到数据库")
         await self._store_relationship_analysis(new_report_id, result)
         
-        print(f"[INFO] [关系分析器] [analyze_report_relationships] 关联分析完成，找到 {len(relations)} 个关联关系")
+        logger.info("[关系分析器] [analyze_report_relationships] 关联分析完成，找到 %s 个关联关系", len(relations))
         return result
     
     async def _store_relationship_analysis(self, source_report_id: str, analysis_result: Dict[str, Any]) -> None:
@@ -462,7 +459,7 @@ class ReportRelationshipAnalyzer:
             source_report_id: 源报告ID
             analysis_result: 分析结果
         """
-        print(f"[DEBUG] [关系分析器] [_store_relationship_analysis] 开始存储关联分析结果, source_report_id={source_report_id}, relations_count={len(analysis_result.get('relations', []))}")
+        logger.debug("[关系分析器] [_store_relationship_analysis] 开始存储关联分析结果, source_report_id=%s, relations_count=%s", source_report_id, len(analysis_result.get('relations', [])))
         
         try:
             # 存储每个关联关系
@@ -474,10 +471,10 @@ class ReportRelationshipAnalyzer:
             
             # 执行数据库操作
             relations = analysis_result.get('relations', [])
-            print(f"[DEBUG] [关系分析器] [_store_relationship_analysis] 准备存储 {len(relations)} 个关联关系")
+            logger.debug("[关系分析器] [_store_relationship_analysis] 准备存储 %s 个关联关系", len(relations))
             
             for i, relation in enumerate(relations):
-                print(f"[DEBUG] [关系分析器] [_store_relationship_analysis] 存储关联关系 {i+1}/{len(relations)}, target_report_id={relation['target_report_id']}")
+                logger.debug("[关系分析器] [_store_relationship_analysis] 存储关联关系 %s/%s, target_report_id=%s", i+1, len(relations), relation['target_report_id'])
                 await self.db.execute_raw_command(insert_sql, (
                     source_report_id,
                     relation['target_report_id'],
@@ -487,14 +484,12 @@ class ReportRelationshipAnalyzer:
                     relation['evidence'],
                     json.dumps(relation, ensure_ascii=False)
                 ))
-                print(f"[DEBUG] [关系分析器] [_store_relationship_analysis] 成功存储关联关系 {i+1}/{len(relations)}")
+                logger.debug("[关系分析器] [_store_relationship_analysis] 成功存储关联关系 %s/%s", i+1, len(relations))
             
-            print(f"[INFO] [关系分析器] [_store_relationship_analysis] 已成功存储 {len(analysis_result.get('relations', []))} 个关联关系")
+            logger.info("[关系分析器] [_store_relationship_analysis] 已成功存储 %s 个关联关系", len(analysis_result.get('relations', [])))
             
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [_store_relationship_analysis] 存储关联分析结果失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [_store_relationship_analysis] 存储关联分析结果失败: %s", e)
     
     async def get_report_relationships(self, source_report_id: str) -> List[Dict[str, Any]]:
         """
@@ -506,15 +501,13 @@ class ReportRelationshipAnalyzer:
         Returns:
             List[Dict]: 关联关系列表
         """
-        print(f"[DEBUG] [关系分析器] [get_report_relationships] 获取报告 {source_report_id} 的关联关系")
+        logger.debug("[关系分析器] [get_report_relationships] 获取报告 %s 的关联关系", source_report_id)
         try:
             relationships = await self.db.get_report_relationships(source_report_id)
-            print(f"[INFO] [关系分析器] [get_report_relationships] 找到 {len(relationships)} 个关联关系")
+            logger.info("[关系分析器] [get_report_relationships] 找到 %s 个关联关系", len(relationships))
             return relationships
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [get_report_relationships] 获取关联关系失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [get_report_relationships] 获取关联关系失败: %s", e)
             return []
     
     async def get_reverse_report_relationships(self, target_report_id: str) -> List[Dict[str, Any]]:
@@ -527,15 +520,13 @@ class ReportRelationshipAnalyzer:
         Returns:
             List[Dict]: 关联关系列表
         """
-        print(f"[DEBUG] [关系分析器] [get_reverse_report_relationships] 获取被报告 {target_report_id} 关联的报告")
+        logger.debug("[关系分析器] [get_reverse_report_relationships] 获取被报告 %s 关联的报告", target_report_id)
         try:
             relationships = await self.db.get_reverse_report_relationships(target_report_id)
-            print(f"[INFO] [关系分析器] [get_reverse_report_relationships] 找到 {len(relationships)} 个反向关联关系")
+            logger.info("[关系分析器] [get_reverse_report_relationships] 找到 %s 个反向关联关系", len(relationships))
             return relationships
         except Exception as e:
-            print(f"[ERROR] [关系分析器] [get_reverse_report_relationships] 获取反向关联关系失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[关系分析器] [get_reverse_report_relationships] 获取反向关联关系失败: %s", e)
             return []
     
     def _generate_fallback_relations(self, candidate_results: List[Dict[str, Any]], historical_reports: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -549,11 +540,11 @@ class ReportRelationshipAnalyzer:
         Returns:
             List[Dict]: 关联关系列表
         """
-        print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 生成备用关联关系, candidate_results={len(candidate_results)}, historical_reports={len(historical_reports)}")
+        logger.debug("[关系分析器] [_generate_fallback_relations] 生成备用关联关系, candidate_results=%s, historical_reports=%s", len(candidate_results), len(historical_reports))
         
         relations = []
         for i, relation in enumerate(candidate_results):
-            print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 处理候选关联 {i+1}/{len(candidate_results)}, related_report_id={relation['related_report_id']}")
+            logger.debug("[关系分析器] [_generate_fallback_relations] 处理候选关联 %s/%s, related_report_id=%s", i+1, len(candidate_results), relation['related_report_id'])
             # 基于相似度得分生成关联类型，使用新的阈值标准（距离<0.6对应相似度>40%）
             score = relation['similarity_score']
             distance = relation.get('distance', 1.0 - score/100.0)  # 计算距离值
@@ -563,16 +554,16 @@ class ReportRelationshipAnalyzer:
             
             if percentage_similarity >= 60:  # 对应距离 <= 0.4
                 relation_type = "验证"
-                print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 相似度 {percentage_similarity:.1f}% -> 验证")
+                logger.debug("[关系分析器] [_generate_fallback_relations] 相似度 %.1f%% -> 验证", percentage_similarity)
             elif percentage_similarity >= 50:  # 对应距离 <= 0.5
                 relation_type = "补充"
-                print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 相似度 {percentage_similarity:.1f}% -> 补充")
+                logger.debug("[关系分析器] [_generate_fallback_relations] 相似度 %.1f%% -> 补充", percentage_similarity)
             elif percentage_similarity >= 40:  # 对应距离 <= 0.6
                 relation_type = "冲突"
-                print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 相似度 {percentage_similarity:.1f}% -> 冲突")
+                logger.debug("[关系分析器] [_generate_fallback_relations] 相似度 %.1f%% -> 冲突", percentage_similarity)
             else:
                 relation_type = "相关"
-                print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 相似度 {percentage_similarity:.1f}% -> 相关")
+                logger.debug("[关系分析器] [_generate_fallback_relations] 相似度 %.1f%% -> 相关", percentage_similarity)
             
             # 从历史报告中获取标题和分类信息
             target_report = next((hr for hr in historical_reports if hr['report_id'] == relation['related_report_id']), None)
@@ -588,9 +579,9 @@ class ReportRelationshipAnalyzer:
                 "score": percentage_similarity / 100.0
             }
             relations.append(relation_data)
-            print(f"[DEBUG] [关系分析器] [_generate_fallback_relations] 添加关联关系: {relation_data['relation_type']}, score={relation_data['score']}")
+            logger.debug("[关系分析器] [_generate_fallback_relations] 添加关联关系: %s, score=%s", relation_data['relation_type'], relation_data['score'])
         
-        print(f"[INFO] [关系分析器] [_generate_fallback_relations] 备用关联关系生成完成, 共生成 {len(relations)} 个关联")
+        logger.info("[关系分析器] [_generate_fallback_relations] 备用关联关系生成完成, 共生成 %s 个关联", len(relations))
         return relations
 
 
@@ -8,6 +8,8 @@ import aiosqlite
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+from ..connection_pool import SQLitePool
+
 # 导入 Schema 定义
 from ..schemas import (
     PortfolioSchemaV1,
@@ -20,14 +22,16 @@ from ..schemas import (
 class PortfolioRepository:
     """用户持仓数据仓库"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLitePool] = None):
         """
         初始化 Repository
         
         Args:
             db_path: 数据库文件路径
+            pool: 共享连接池（由 DatabaseManager 传入；缺省时每次操作独立连接）
         """
         self.db_path = db_path
+        self.pool = pool or SQLitePool(db_path)
     
     async def get_user_portfolio(self, user_id: str = 'default') -> Optional[PortfolioSchemaV1]:
         """
@@ -39,7 +43,7 @@ class PortfolioRepository:
         Returns:
             持仓数据，如果不存在返回 None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """
@@ -73,6 +77,24 @@ class PortfolioRepository:
             
             return portfolio_data
     
+    async def is_empty(self, user_id: str = 'default') -> bool:
+        """
+        判断用户持仓是否为空（只读 total_asset_value，不读取和解析 holdings_json）
+        
+        Args:
+            user_id: 用户ID
+            
+        Returns:
+            持仓不存在或总资产为 0 时返回 True
+        """
+        async with self.pool.acquire() as db:
+            cursor = await db.execute(
+                "SELECT total_asset_value = 0 FROM user_portfolios WHERE user_id = ? LIMIT 1",
+                (user_id,)
+            )
+            row = await cursor.fetchone()
+            return row is None or bool(row[0])
+    
     async def upsert_user_portfolio(
         self, 
         user_id: str, 
@@ -97,7 +119,7 @@ class PortfolioRepository:
             ensure_ascii=False
         )
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 """
                 INSERT INTO user_portfolios (
@@ -133,7 +155,7 @@ class PortfolioRepository:
         Returns:
             是否成功删除
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             cursor = await db.execute(
                 "DELETE FROM user_portfolios WHERE user_id = ?",
                 (user_id,)
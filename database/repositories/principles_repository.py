@@ -8,6 +8,8 @@ import aiosqlite
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+from ..connection_pool import SQLitePool
+
 # 导入 Schema 定义
 from ..schemas import (
     PrinciplesSchemaV1,
@@ -20,14 +22,16 @@ from ..schemas import (
 class PrinciplesRepository:
     """用户投资原则数据仓库"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLitePool] = None):
         """
         初始化 Repository
         
         Args:
             db_path: 数据库文件路径
+            pool: 共享连接池（由 DatabaseManager 传入；缺省时每次操作独立连接）
         """
         self.db_path = db_path
+        self.pool = pool or SQLitePool(db_path)
     
     async def get_user_principles(
         self, 
@@ -44,7 +48,7 @@ class PrinciplesRepository:
         Returns:
             投资原则数据，如果不存在返回 None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             
             if profile_name:
@@ -136,7 +140,7 @@ class PrinciplesRepository:
         profile_name = validated_data['profile_name']
         version = validated_data['version']
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 """
                 INSERT INTO user_investment_principles (
@@ -179,7 +183,7 @@ class PrinciplesRepository:
         Returns:
             是否成功删除
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             if profile_name:
                 cursor = await db.execute(
                     "DELETE FROM user_investment_principles WHERE user_id = ? AND profile_name = ?",
@@ -215,7 +219,7 @@ class PrinciplesRepository:
         Returns:
             原则档案列表（每个元素包含 profile_name, version, is_active, updated_at）
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """
@@ -259,7 +263,7 @@ class PrinciplesRepository:
         Returns:
             是否成功设置
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             # 先将该用户所有档案设为非激活
             await db.execute(
                 "UPDATE user_investment_principles SET is_active = 0 WHERE user_id = ?",
@@ -13,18 +13,22 @@ import aiosqlite
 import json
 from typing import Optional, Dict, Any, List
 
+from ..connection_pool import SQLitePool
+
 
 class WatchlistRepository:
     """关注列表 Repository"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLitePool] = None):
         """
         初始化 Repository
         
         Args:
             db_path: 数据库文件路径
+            pool: 共享连接池（由 DatabaseManager 传入；缺省时每次操作独立连接）
         """
         self.db_path = db_path
+        self.pool = pool or SQLitePool(db_path)
     
     async def add_item(
         self,
@@ -52,7 +56,7 @@ class WatchlistRepository:
         if alert_conditions:
             conditions_json = json.dumps(alert_conditions, ensure_ascii=False)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             cursor = await db.execute("""
                 INSERT INTO watchlist (user_id, target_name, target_type, alert_conditions, notes)
                 VALUES (?, ?, ?, ?, ?)
@@ -76,7 +80,7 @@ class WatchlistRepository:
         Returns:
             List[Dict]: 关注项列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT * FROM watchlist
@@ -107,7 +111,7 @@ class WatchlistRepository:
         Returns:
             Dict: 关注项数据
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM watchlist WHERE id = ?",
@@ -126,6 +130,39 @@ class WatchlistRepository:
             
             return None
     
+    async def get_items_bulk(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        批量获取关注项（单条 IN 查询）
+        
+        Args:
+            item_ids: 关注项 ID 列表
+        
+        Returns:
+            List[Dict]: 存在的关注项（按 ID 升序）
+        """
+        if not item_ids:
+            return []
+        
+        placeholders = ','.join('?' * len(item_ids))
+        async with self.pool.acquire() as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute(
+                f"SELECT * FROM watchlist WHERE id IN ({placeholders}) ORDER BY id",
+                list(item_ids)
+            )
+            rows = await cursor.fetchall()
+            items = [dict(row) for row in rows]
+            
+            # 反序列化 JSON 字段
+            for item in items:
+                if item.get('alert_conditions'):
+                    try:
+                        item['alert_conditions'] = json.loads(item['alert_conditions'])
+                    except json.JSONDecodeError:
+                        item['alert_conditions'] = None
+            
+            return items
+    
     async def update_item(
         self,
         item_id: int,
@@ -158,7 +195,7 @@ class WatchlistRepository:
         
         values.append(item_id)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 f"UPDATE watchlist SET {', '.join(fields)} WHERE id = ?",
                 values
@@ -166,6 +203,67 @@ class WatchlistRepository:
             await db.commit()
             return True
     
+    async def update_items_bulk(self, items: List[Dict[str, Any]]) -> int:
+        """
+        批量更新关注项（同一事务内，按更新字段分组 executemany）
+        
+        Args:
+            items: [{'id': 关注项 ID, 字段: 新值, ...}, ...]
+        
+        Returns:
+            int: 实际更新的行数
+        """
+        # 按更新字段组合分组，每组一条 UPDATE 语句
+        groups: Dict[tuple, List[list]] = {}
+        for item in items:
+            updates = {
+                key: value for key, value in item.items()
+                if key in ['target_name', 'target_type', 'alert_conditions', 'status', 'notes']
+            }
+            if not updates or 'id' not in item:
+                continue
+            if isinstance(updates.get('alert_conditions'), dict):
+                updates['alert_conditions'] = json.dumps(updates['alert_conditions'], ensure_ascii=False)
+            fields = tuple(sorted(updates))
+            groups.setdefault(fields, []).append([updates[f] for f in fields] + [item['id']])
+        
+        if not groups:
+            return 0
+        
+        updated = 0
+        async with self.pool.write() as db:
+            for fields, rows in groups.items():
+                set_clause = ', '.join(f"{field} = ?" for field in fields)
+                cursor = await db.executemany(
+                    f"UPDATE watchlist SET {set_clause} WHERE id = ?",
+                    rows
+                )
+                updated += cursor.rowcount
+            await db.commit()
+        return updated
+    
+    async def delete_items_bulk(self, item_ids: List[int]) -> int:
+        """
+        批量硬删除关注项（单条 IN 语句）
+        
+        Args:
+            item_ids: 关注项 ID 列表
+        
+        Returns:
+            int: 删除的行数
+        """
+        if not item_ids:
+            return 0
+        
+        placeholders = ','.join('?' * len(item_ids))
+        async with self.pool.write() as db:
+            cursor = await db.execute(
+                f"DELETE FROM watchlist WHERE id IN ({placeholders})",
+                list(item_ids)
+            )
+            await db.commit()
+            return cursor.rowcount
+    
     async def remove_item(self, item_id: int) -> bool:
         """
         删除关注项 (软删除，设置 status = 'inactive')
@@ -176,7 +274,7 @@ class WatchlistRepository:
         Returns:
             bool: 是否成功
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 "UPDATE watchlist SET status = 'inactive' WHERE id = ?",
                 (item_id,)
@@ -194,7 +292,7 @@ class WatchlistRepository:
         Returns:
             bool: 是否成功
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.write() as db:
             await db.execute(
                 "DELETE FROM watchlist WHERE id = ?",
                 (item_id,)
@@ -219,7 +317,7 @@ class WatchlistRepository:
         Returns:
             List[Dict]: 关注项列表
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.acquire() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("""
                 SELECT * FROM watchlist
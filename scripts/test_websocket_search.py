@@ -13,7 +13,6 @@ python scripts/test_websocket_search.py
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
@@ -21,102 +20,222 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    import websockets
+    from websockets.asyncio.client import connect
 except ImportError:
-    print("❌ 错误: 缺少 websockets 库")
-    print("请安装: pip install websockets")
+    print("❌ 错误: 缺少 websockets 库（需要 13.0 及以上版本）")
+    print("请安装: pip install -U websockets")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    print("❌ 错误: 缺少 orjson 库")
+    print("请安装: pip install orjson")
+    sys.exit(1)
+
+WS_URI = "ws://localhost:3000/ws"
+
+# 流式搜索会连续推送大量小帧：关闭 permessage-deflate，避免客户端逐帧 inflate
+WS_CONNECT_OPTIONS = {
+    "compression": None,
+    "max_size": 2 ** 22,
+    "write_limit": 2 ** 20,
+}
+
+# 静态搜索请求：模块加载时序列化一次，发送时直接复用
+# （以文本帧发送，服务端使用 receive_text 接收）
+FINANCE_QUERY = "芯片投资建议"
+GENERAL_QUERY = "今天北京今天汽车限行尾号"
+MULTI_TURN_QUERIES = ("法国的首都是哪里？", "那个城市的人口有多少？")
+
+_FINANCE_REQ = orjson.dumps({"type": "search", "query": FINANCE_QUERY, "limit": 5}).decode()
+_GENERAL_REQ = orjson.dumps({"type": "search", "query": GENERAL_QUERY, "limit": 5}).decode()
+_MULTI_Q1 = orjson.dumps({"type": "search", "query": MULTI_TURN_QUERIES[0]}).decode()
+
+# 追问请求带动态 session_id，复用同一个 dict，只替换 session_id
+_MULTI_Q2 = {"type": "search", "query": MULTI_TURN_QUERIES[1], "session_id": None}
+
+# 服务端定时推送的后台消息（type 是第一个字段，只需检查帧头）
+_BACKGROUND_FRAME_TYPES = (b'"reports_update"', b'"ui_state_update"', b'"ui_state_templates"')
+
+
+def is_background_frame(raw: bytes) -> bool:
+    """根据帧头判断是否为后台推送消息，命中时可跳过完整的 JSON 解析"""
+    head = raw[:64]
+    return any(token in head for token in _BACKGROUND_FRAME_TYPES)
+
+
+class FrameReader:
+    """
+    按批读取 WebSocket 帧
+
+    流式输出时服务端会连续推送大量 search_chunk：
+    - 拿到一帧后，用 timeout=0 的 asyncio.wait 顺带取出接收队列中已到达的后续帧，
+      不再为每个 token 回到 selector 等待
+    - 复用预先创建的 recv 任务，并以单一截止时间（收到帧后重置）代替逐帧
+      wait_for，省去每帧一次的定时器创建与取消
+    """
+
+    def __init__(self, websocket, timeout: float):
+        """
+        Args:
+            websocket: WebSocket 连接
+            timeout: 两批消息之间允许的最长等待时间（秒）
+        """
+        self.websocket = websocket
+        self.timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self._deadline = self._loop.time() + timeout
+        self._recv_task = None
+
+    def reset(self, timeout: float) -> None:
+        """切换超时时间并重新开始计时（每个测试开始接收前调用）"""
+        self.timeout = timeout
+        self._deadline = self._loop.time() + timeout
+
+    def _next_recv(self) -> asyncio.Future:
+        # decode=False：文本帧直接返回 UTF-8 字节，交给 orjson 解析
+        task = asyncio.ensure_future(self.websocket.recv(decode=False))
+        # 连接关闭时未被消费的 recv 任务会带着异常结束，这里直接取走异常
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def next_batch(self) -> list:
+        """
+        等待下一批消息
+
+        Returns:
+            list: 本批次收到的原始消息（bytes）
+
+        Raises:
+            asyncio.TimeoutError: 超过截止时间仍未收到消息
+        """
+        if self._recv_task is None:
+            self._recv_task = self._next_recv()
+
+        remaining = max(0.0, self._deadline - self._loop.time())
+        done, _ = await asyncio.wait({self._recv_task}, timeout=remaining)
+        if not done:
+            raise asyncio.TimeoutError
+
+        batch = []
+        while done:
+            task, self._recv_task = self._recv_task, None
+            batch.append(task.result())
+            # 队列未空时下一个 recv 会立即完成；否则保留该任务供下一批复用
+            self._recv_task = self._next_recv()
+            done, _ = await asyncio.wait({self._recv_task}, timeout=0)
+
+        self._deadline = self._loop.time() + self.timeout
+        return batch
+
+
+async def ainput(prompt: str) -> str:
+    """在线程池中读取用户输入，避免阻塞事件循环"""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+
+def flush_chunks(pending: list) -> None:
+    """把累积的流式文本一次性写出并 flush"""
+    if pending:
+        sys.stdout.write(''.join(pending))
+        sys.stdout.flush()
+        pending.clear()
+
 
-async def test_finance_search():
+async def test_finance_search(reader: FrameReader):
     """测试金融问题搜索（本地数据库）"""
     print("\n" + "=" * 60)
     print("🧪 Test 1: 金融问题搜索（本地数据库）")
     print("=" * 60)
     
-    uri = "ws://localhost:3000/ws"
-    
     try:
-        async with websockets.connect(uri) as websocket:
-            print(f"✅ 连接到 {uri}")
-            
-            # 接收连接确认消息
-            message = await websocket.recv()
-            data = json.loads(message)
-            print(f"📩 接收: {data.get('type')}")
-            
-            # 发送搜索请求
-            search_request = {
-                "type": "search",
-                "query": "芯片投资建议",
-                "limit": 5
-            }
-            
-            print(f"\n📤 发送搜索请求: {search_request['query']}")
-            await websocket.send(json.dumps(search_request))
+        websocket = reader.websocket
+        
+        # 发送搜索请求
+        print(f"\n📤 发送搜索请求: {FINANCE_QUERY}")
+        await websocket.send(_FINANCE_REQ)
+        
+        # 接收响应
+        reader.reset(30.0)
+        chunks = []  # 收集流式文本（结束时一次性拼接）
+        pending = []  # 待输出的流式文本
+        finished = False
+        while not finished:
+            try:
+                batch = await reader.next_batch()
+            except asyncio.TimeoutError:
+                flush_chunks(pending)
+                print(f"\n⏰ 超时！等待响应超过 30 秒")
+                break
+            except Exception as e:
+                flush_chunks(pending)
+                print(f"\n❌ 接收消息失败: {e}")
+                raise
             
-            # 接收响应
-            collected_text = ""  # 收集流式文本
-            while True:
-                try:
-                    message = await asyncio.wait_for(websocket.recv(), timeout=30.0)
-                    data = json.loads(message)
-                    msg_type = data.get("type")
-                    
-                    # 忽略非搜索相关消息（后台定时推送）
-                    if msg_type in ["reports_update", "ui_state_update", "ui_state_templates", "connected"]:
-                        print(f"\n⏭️  忽略后台消息: {msg_type}")
-                        continue
-                    
-                    print(f"\n📨 收到消息: {msg_type}")
-                    
-                    if msg_type == "search_status":
-                        print(f"📊 状态: {data.get('message')}")
-                    
-                    elif msg_type == "search_intent":
-                        print(f"💡 意图: {data.get('intent')} (置信度: {data.get('confidence')})")
-                        print(f"   理由: {data.get('reason')}")
-                    
-                    elif msg_type == "search_chunk":
-                        # 流式文本（本地搜索也支持流式输出）
-                        text = data.get('text', '')
-                        collected_text += text
-                        print(text, end='', flush=True)
-                    
-                    elif msg_type == "search_result":
-                        results = data.get('results', [])
-                        print(f"📋 搜索结果: {len(results)} 条")
-                        for i, result in enumerate(results[:3], 1):
-                            title = result.get('title', '无标题')
-                            print(f"   {i}. {title}")
-                    
-                    elif msg_type == "search_complete":
-                        if collected_text:
-                            print(f"\n\n📝 收集的回答总长度: {len(collected_text)} 字符")
-                        print(f"✅ 搜索完成 (成本: ${data.get('cost', 0):.6f})")
-                        break
-                    
-                    elif msg_type == "search_error":
-                        print(f"❌ 搜索失败: {data.get('message')}")
-                        break
-                    
-                    else:
-                        print(f"⚠️  未知搜索消息类型: {msg_type}")
-                        
-                except asyncio.TimeoutError:
-                    print(f"\n⏰ 超时！等待响应超过 30 秒")
+            for message in batch:
+                # 忽略后台定时推送，不做完整解析
+                if is_background_frame(message):
+                    continue
+                
+                data = orjson.loads(message)
+                msg_type = data.get("type")
+                
+                if msg_type == "search_chunk":
+                    # 流式文本（本地搜索也支持流式输出），按批次合并输出
+                    text = data.get('text', '')
+                    chunks.append(text)
+                    pending.append(text)
+                    continue
+                
+                flush_chunks(pending)
+                
+                # 忽略其他非搜索相关消息
+                if msg_type in ["reports_update", "ui_state_update", "ui_state_templates", "connected"]:
+                    print(f"\n⏭️  忽略后台消息: {msg_type}")
+                    continue
+                
+                print(f"\n📨 收到消息: {msg_type}")
+                
+                if msg_type == "search_status":
+                    print(f"📊 状态: {data.get('message')}")
+                
+                elif msg_type == "search_intent":
+                    print(f"💡 意图: {data.get('intent')} (置信度: {data.get('confidence')})")
+                    print(f"   理由: {data.get('reason')}")
+                
+                elif msg_type == "search_result":
+                    results = data.get('results', [])
+                    print(f"📋 搜索结果: {len(results)} 条")
+                    for i, result in enumerate(results[:3], 1):
+                        title = result.get('title', '无标题')
+                        print(f"   {i}. {title}")
+                
+                elif msg_type == "search_complete":
+                    collected_text = ''.join(chunks)
+                    if collected_text:
+                        print(f"\n\n📝 收集的回答总长度: {len(collected_text)} 字符")
+                    print(f"✅ 搜索完成 (成本: ${data.get('cost', 0):.6f})")
+                    finished = True
                     break
-                except Exception as e:
-                    print(f"\n❌ 接收消息失败: {e}")
-                    raise
-            
-            print("✅ 测试 1 通过")
+                
+                elif msg_type == "search_error":
+                    print(f"❌ 搜索失败: {data.get('message')}")
+                    finished = True
+                    break
+                
+                else:
+                    print(f"⚠️  未知搜索消息类型: {msg_type}")
             
+            flush_chunks(pending)
+        
+        print("✅ 测试 1 通过")
+        
     except Exception as e:
         print(f"❌ 测试 1 失败: {e}")
 
 
-async def test_general_search():
+async def test_general_search(reader: FrameReader):
     """测试通用问题搜索（网络搜索）"""
     print("\n" + "=" * 60)
     print("🧪 Test 2: 通用问题搜索（网络搜索）")
@@ -125,66 +244,67 @@ async def test_general_search():
     print("⚠️  注意: 此测试需要 ANTHROPIC_AUTH_TOKEN 环境变量")
     print("⚠️  注意: 此测试会调用 Claude API 并产生费用")
     
-    choice = input("\n是否继续测试网络搜索功能? (y/n): ")
+    choice = await ainput("\n是否继续测试网络搜索功能? (y/n): ")
     if choice.lower() != 'y':
         print("跳过测试 2")
         return
     
-    uri = "ws://localhost:3000/ws"
-    
     try:
-        async with websockets.connect(uri) as websocket:
-            print(f"✅ 连接到 {uri}")
-            
-            # 接收连接确认消息
-            await websocket.recv()
-            
-            # 发送搜索请求
-            search_request = {
-                "type": "search",
-                "query": "今天北京今天汽车限行尾号",
-                "limit": 5
-            }
-            
-            print(f"\n📤 发送搜索请求: {search_request['query']}")
-            await websocket.send(json.dumps(search_request))
-            
-            # 接收响应
-            collected_text = ""
-            while True:
-                message = await asyncio.wait_for(websocket.recv(), timeout=60.0)
-                data = json.loads(message)
+        websocket = reader.websocket
+        
+        # 发送搜索请求
+        print(f"\n📤 发送搜索请求: {GENERAL_QUERY}")
+        await websocket.send(_GENERAL_REQ)
+        
+        # 接收响应
+        reader.reset(60.0)
+        chunks = []
+        pending = []
+        finished = False
+        while not finished:
+            for message in await reader.next_batch():
+                if is_background_frame(message):
+                    continue
+                
+                data = orjson.loads(message)
                 msg_type = data.get("type")
                 
+                if msg_type == "search_chunk":
+                    # 流式文本
+                    text = data.get('text', '')
+                    chunks.append(text)
+                    pending.append(text)
+                    continue
+                
+                flush_chunks(pending)
+                
                 if msg_type == "search_status":
                     print(f"📊 状态: {data.get('message')}")
                 
                 elif msg_type == "search_intent":
                     print(f"💡 意图: {data.get('intent')}")
                 
-                elif msg_type == "search_chunk":
-                    # 流式文本
-                    text = data.get('text', '')
-                    collected_text += text
-                    print(text, end='', flush=True)
-                
                 elif msg_type == "search_complete":
                     print(f"\n✅ 搜索完成 (成本: ${data.get('cost', 0):.6f})")
                     session_id = data.get('session_id')
                     print(f"🔑 Session ID: {session_id}")
+                    finished = True
                     break
                 
                 elif msg_type == "search_error":
                     print(f"❌ 搜索失败: {data.get('message')}")
+                    finished = True
                     break
             
-            print("\n✅ 测试 2 通过")
-            
+            flush_chunks(pending)
+        
+        print("\n✅ 测试 2 通过")
+        
     except Exception as e:
         print(f"❌ 测试 2 失败: {e}")
 
 
-async def test_multi_turn_conversation():
+async def test_multi_turn_conversation(reader: FrameReader):
     """测试多轮对话"""
     print("\n" + "=" * 60)
     print("🧪 Test 3: 多轮对话（追问）")
@@ -192,83 +312,93 @@ async def test_multi_turn_conversation():
     
     print("⚠️  注意: 此测试需要 ANTHROPIC_AUTH_TOKEN 环境变量")
     
-    choice = input("\n是否继续测试多轮对话功能? (y/n): ")
+    choice = await ainput("\n是否继续测试多轮对话功能? (y/n): ")
     if choice.lower() != 'y':
         print("跳过测试 3")
         return
     
-    uri = "ws://localhost:3000/ws"
     session_id = None
     
     try:
-        async with websockets.connect(uri) as websocket:
-            print(f"✅ 连接到 {uri}")
-            
-            # 接收连接确认消息
-            await websocket.recv()
-            
-            # 第一轮：询问巴黎
-            print("\n--- 第一轮对话 ---")
-            search_request = {
-                "type": "search",
-                "query": "法国的首都是哪里？"
-            }
-            
-            print(f"📤 发送: {search_request['query']}")
-            await websocket.send(json.dumps(search_request))
-            
-            # 接收第一轮响应
-            while True:
-                message = await asyncio.wait_for(websocket.recv(), timeout=60.0)
-                data = json.loads(message)
+        websocket = reader.websocket
+        
+        # 第一轮：询问巴黎
+        print("\n--- 第一轮对话 ---")
+        print(f"📤 发送: {MULTI_TURN_QUERIES[0]}")
+        await websocket.send(_MULTI_Q1)
+        
+        # 接收第一轮响应
+        reader.reset(60.0)
+        pending = []
+        finished = False
+        while not finished:
+            for message in await reader.next_batch():
+                if is_background_frame(message):
+                    continue
+                
+                data = orjson.loads(message)
                 msg_type = data.get("type")
                 
                 if msg_type == "search_chunk":
-                    print(data.get('text', ''), end='', flush=True)
+                    pending.append(data.get('text', ''))
+                    continue
                 
-                elif msg_type == "search_complete":
+                flush_chunks(pending)
+                
+                if msg_type == "search_complete":
                     session_id = data.get('session_id')
                     print(f"\n🔑 保存 Session ID: {session_id}")
+                    finished = True
                     break
                 
                 elif msg_type == "search_error":
                     print(f"❌ 第一轮失败: {data.get('message')}")
                     return
             
-            if not session_id:
-                print("❌ 未获取到 session_id，无法继续多轮对话")
-                return
-            
-            # 第二轮：追问（测试上下文记忆）
-            print("\n\n--- 第二轮对话（追问）---")
-            search_request = {
-                "type": "search",
-                "query": "那个城市的人口有多少？",  # ✅ 测试 AI 是否记得"那个城市"指巴黎
-                "session_id": session_id  # ✅ 传递 session_id
-            }
-            
-            print(f"📤 发送: {search_request['query']}")
-            await websocket.send(json.dumps(search_request))
-            
-            # 接收第二轮响应
-            while True:
-                message = await asyncio.wait_for(websocket.recv(), timeout=60.0)
-                data = json.loads(message)
+            flush_chunks(pending)
+        
+        if not session_id:
+            print("❌ 未获取到 session_id，无法继续多轮对话")
+            return
+        
+        # 第二轮：追问（测试上下文记忆）
+        print("\n\n--- 第二轮对话（追问）---")
+        # ✅ 测试 AI 是否记得"那个城市"指巴黎，并传递 session_id
+        _MULTI_Q2["session_id"] = session_id
+        
+        print(f"📤 发送: {MULTI_TURN_QUERIES[1]}")
+        await websocket.send(orjson.dumps(_MULTI_Q2).decode())
+        
+        # 接收第二轮响应
+        finished = False
+        while not finished:
+            for message in await reader.next_batch():
+                if is_background_frame(message):
+                    continue
+                
+                data = orjson.loads(message)
                 msg_type = data.get("type")
                 
                 if msg_type == "search_chunk":
-                    print(data.get('text', ''), end='', flush=True)
+                    pending.append(data.get('text', ''))
+                    continue
                 
-                elif msg_type == "search_complete":
+                flush_chunks(pending)
+                
+                if msg_type == "search_complete":
                     print(f"\n✅ 第二轮完成")
+                    finished = True
                     break
                 
                 elif msg_type == "search_error":
                     print(f"❌ 第二轮失败: {data.get('message')}")
+                    finished = True
                     break
             
-            print("\n✅ 测试 3 通过（多轮对话成功）")
-            
+            flush_chunks(pending)
+        
+        print("\n✅ 测试 3 通过（多轮对话成功）")
+        
     except Exception as e:
         print(f"❌ 测试 3 失败: {e}")
 
@@ -283,16 +413,26 @@ async def main():
     
     try:
         # 等待用户确认
-        input("\n按 Enter 键开始测试...")
+        await ainput("\n按 Enter 键开始测试...")
         
-        # 测试 1: 金融问题搜索
-        await test_finance_search()
-        
-        # 测试 2: 通用问题搜索（可选）
-        #await test_general_search()
-        
-        # 测试 3: 多轮对话（可选）
-        #await test_multi_turn_conversation()
+        # 所有测试复用同一个连接，只握手一次
+        async with connect(WS_URI, **WS_CONNECT_OPTIONS) as websocket:
+            print(f"✅ 连接到 {WS_URI}")
+            
+            # 接收连接确认消息（仅在建立连接时推送一次）
+            data = orjson.loads(await websocket.recv(decode=False))
+            print(f"📩 接收: {data.get('type')}")
+            
+            reader = FrameReader(websocket, timeout=30.0)
+            
+            # 测试 1: 金融问题搜索
+            await test_finance_search(reader)
+            
+            # 测试 2: 通用问题搜索（可选）
+            #await test_general_search(reader)
+            
+            # 测试 3: 多轮对话（可选）
+            #await test_multi_turn_conversation(reader)
         
         print("\n" + "=" * 60)
         print("✅ 所有测试完成!")
@@ -307,4 +447,16 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 优先使用 uvloop 事件循环（未安装时退回默认循环）
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        if sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(main())
+        else:
+            # Python 3.10 没有 asyncio.Runner
+            uvloop.install()
+            asyncio.run(main())
@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import io
 import sys
 from pathlib import Path
 
@@ -21,24 +22,79 @@ if env_path.exists():
 from agent.custom_scripts.listeners import report_analyzer
 
 
+# 摘要提取的章节标题及单个字段的最大长度
+SUMMARY_SECTIONS = ('【核心观点】', '【市场数据】', '【投资建议】', '【重要性评分】')
+SECTION_MAX_CHARS = 512
+
+# 直接在 UTF-8 字节上查找章节，无需先解码全文
+_SECTION_HEADERS = tuple((h[1:-1], h.encode('utf-8')) for h in SUMMARY_SECTIONS)
+_SECTION_OPEN = '【'.encode('utf-8')
+
+
+def summarize_report(raw: bytes) -> dict:
+    """
+    一次扫描提取报告的关键章节（用于构建精简的事件数据）
+    
+    Args:
+        raw: 报告原文（UTF-8 字节）
+    
+    Returns:
+        dict: {章节名: 章节内容（最多 SECTION_MAX_CHARS 个字符）}
+    """
+    sections = {}
+    for name, header in _SECTION_HEADERS:
+        start = raw.find(header)
+        if start == -1:
+            continue
+        start += len(header)
+        # 章节到下一个【...】标题为止
+        end = raw.find(_SECTION_OPEN, start)
+        if end == -1:
+            end = len(raw)
+        # 只解码截断后的片段（UTF-8 单字符最多 4 字节）
+        chunk = raw[start:min(end, start + SECTION_MAX_CHARS * 4)]
+        text = chunk.decode('utf-8', errors='ignore')
+        sections[name] = text[:SECTION_MAX_CHARS].strip()
+    return sections
+
+
 # 模拟 ListenerContext
 class SimpleContext:
-    """简单的 ListenerContext 实现"""
+    """
+    简单的 ListenerContext 实现
+    
+    通知和 UI 状态更新写入内存缓冲区，执行结束后由 flush() 一次性输出
+    """
+    
+    _PRIORITY_ICONS = {"high": "🔴", "medium": "🟡"}
     
     async def notify(self, message: str, options: dict = None):
         priority = options.get('priority', 'normal') if options else 'normal'
-        icon = "🔴" if priority == "high" else "🟡" if priority == "medium" else "🟢"
-        print(f"\n{icon} 【通知】 {message}\n")
+        icon = self._PRIORITY_ICONS.get(priority, "🟢")
+        self._buf.write(f"\n{icon} 【通知】 {message}\n\n")
     
     class UIState:
+        def __init__(self, buf: io.StringIO):
+            self._buf = buf
+        
         async def get(self, state_id: str):
             return None  # 简化实现
         
         async def set(self, state_id: str, data: dict):
-            print(f"✅ UI状态已更新: {state_id}")
+            self._buf.write(f"✅ UI状态已更新: {state_id}\n")
     
     def __init__(self):
-        self.uiState = self.UIState()
+        self._buf = io.StringIO()
+        self.uiState = self.UIState(self._buf)
+    
+    def flush(self):
+        """输出缓冲的通知并清空缓冲区"""
+        output = self._buf.getvalue()
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+        self._buf.seek(0)
+        self._buf.truncate()
 
 
 async def trigger_analysis(report_file: str = None):
@@ -54,8 +110,8 @@ async def trigger_analysis(report_file: str = None):
     
     # 准备事件数据
     if report_file and Path(report_file).exists():
-        with open(report_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # 只读取字节，全文解码交给 handler 按需进行
+        raw = Path(report_file).read_bytes()
         filename = Path(report_file).name
         file_path = str(Path(report_file).absolute())
     else:
@@ -142,19 +198,23 @@ ETF资金流向显示市场正构建"防御+跨境低估值"新均衡：
 紧急性：8/10
 可靠性：9/10
         """
+        raw = content.encode('utf-8')
     
     print(f"\n📄 报告信息:")
     print(f"   文件名: {filename}")
-    print(f"   内容长度: {len(content)} 字符")
+    print(f"   内容大小: {len(raw)} 字节")
     if file_path:
         print(f"   文件路径: {file_path}")
     
-    # 构建事件数据
+    # 构建事件数据（只携带章节摘要，有文件路径时由 handler 按需读取全文）
     event_data = {
         'filename': filename,
-        'content': content,
+        'sections': summarize_report(raw),
+        'content_len': len(raw),
         'file_path': file_path
     }
+    if not file_path:
+        event_data['content'] = content
     
     # 创建上下文
     context = SimpleContext()
@@ -165,7 +225,10 @@ ETF资金流向显示市场正构建"防御+跨境低估值"新均衡：
     print(f"   Listener 名称: {report_analyzer.config['name']}")
     
     try:
-        result = await report_analyzer.handler(event_data, context)
+        try:
+            result = await report_analyzer.handler(event_data, context)
+        finally:
+            context.flush()
         
         print(f"\n✅ 执行完成!")
         print(f"\n📊 执行结果:")
@@ -217,4 +280,16 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 优先使用 uvloop 事件循环（未安装时退回默认循环）
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        if sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(main())
+        else:
+            # Python 3.10 没有 asyncio.Runner
+            uvloop.install()
+            asyncio.run(main())
@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# Finance Agent 部署机网络调优（Linux，需要 root）
+#
+# - fq 队列规则: 按流公平调度，避免大响应（报告列表）挤占 WebSocket 小帧
+# - rmem_max/wmem_max: 放宽套接字缓冲区上限，
+#   否则 server.py 中 SOCKET_BUFFER_SIZE 设置的 SO_SNDBUF/SO_RCVBUF 会被截断
+#
+# 用法: sudo ./scripts/tune_network.sh [网卡名，默认 eth0]
+
+set -e
+
+IFACE=${1:-eth0}
+
+echo "🔧 Tuning network for Finance Agent (interface: $IFACE)"
+
+tc qdisc replace dev "$IFACE" root fq
+echo "   ✅ qdisc: fq"
+
+sysctl -w net.core.rmem_max=67108864 net.core.wmem_max=67108864
+echo "   ✅ socket buffer limits: 64MB"
+
+echo ""
+echo "⚠️  以上设置重启后失效，持久化请写入 /etc/sysctl.d/ 和网络配置"
@@ -2,24 +2,39 @@
 API 端点模块
 
 遵守规范：API 代码模块化设计，不放在 database_manager.py 中
+
+路由按需导入（PEP 562）：`from server.endpoints import portfolio_router`
+只会加载 portfolio 模块，未使用的端点模块不会被导入。
 """
 
-from .reports import router as reports_router
-from .watchlist import router as watchlist_router
-from .portfolio import router as portfolio_router
-from .principles import router as principles_router
-from .ui_states import router as ui_states_router
-from .actions import router as actions_router
-from .listeners import router as listeners_router
-from .search import router as search_router
-
-__all__ = [
-    'reports_router',
-    'watchlist_router',
-    'portfolio_router',
-    'principles_router',
-    'ui_states_router',
-    'actions_router',
-    'listeners_router',
-    'search_router',
-]
+import importlib
+
+# 路由名 → 端点模块名（只读映射，__getattr__ 直接查表）
+_ROUTER_MODULES = {
+    'reports_router': 'reports',
+    'watchlist_router': 'watchlist',
+    'portfolio_router': 'portfolio',
+    'principles_router': 'principles',
+    'ui_states_router': 'ui_states',
+    'actions_router': 'actions',
+    'listeners_router': 'listeners',
+    'search_router': 'search',
+}
+
+__all__ = tuple(_ROUTER_MODULES)
+
+
+def __getattr__(name):
+    """首次访问 *_router 时导入对应的端点模块，并缓存到模块命名空间"""
+    module_name = _ROUTER_MODULES.get(name)
+    if module_name is None:
+        # 非路由名称（如子模块 reports）交回常规导入机制处理
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    router = importlib.import_module('.' + module_name, __name__).router
+    globals()[name] = router
+    return router
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
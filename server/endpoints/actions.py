@@ -7,10 +7,21 @@ Actions API 端点
 - 获取 Action 执行历史
 """
 
+import logging
+
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+
+from server.endpoints.common import StaticError, load_json
+
+logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/actions", tags=["actions"])
+router = APIRouter(prefix="/api/actions", tags=["actions"], default_response_class=ORJSONResponse)
+
+# 固定错误响应（预先序列化）
+_ERR_TEMPLATES = {
+    'missing_instance_id': StaticError(400, {"error": "instance_id is required"}),
+}
 
 # 依赖注入
 actions_manager = None
@@ -22,7 +33,7 @@ def set_dependencies(actions):
     actions_manager = actions
 
 
-@router.get("/templates")
+@router.get("/templates", response_model=None)
 async def list_action_templates():
     """
     获取 Action 模板列表
@@ -32,9 +43,9 @@ async def list_action_templates():
     """
     try:
         templates = actions_manager.get_all_templates()
-        return {"templates": templates}
+        return ORJSONResponse({"templates": templates})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -53,15 +64,12 @@ async def execute_action(request: Request):
         - Action 执行结果
     """
     try:
-        data = await request.json()
+        data = await load_json(request)
         instance_id = data.get("instance_id")
         session_id = data.get("session_id")
         
         if not instance_id:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "instance_id is required"}
-            )
+            return _ERR_TEMPLATES['missing_instance_id']()
         
         # 执行 Action（通过 ActionsManager）
         result = await actions_manager.execute_action(
@@ -71,15 +79,14 @@ async def execute_action(request: Request):
         
         return result
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return JSONResponse(
+        logger.exception("execute_action failed")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
-@router.get("/stats")
+@router.get("/stats", response_model=None)
 async def get_action_stats():
     """
     获取 Action 统计信息
@@ -89,13 +96,9 @@ async def get_action_stats():
         - template_list: 模板列表
     """
     try:
-        templates = actions_manager.get_all_templates()
-        return {
-            "total_templates": len(templates),
-            "template_list": [t.get('id') for t in templates]
-        }
+        return ORJSONResponse(actions_manager.get_stats_cached())
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -0,0 +1,87 @@
+"""
+端点公共工具
+
+- StaticError: 固定内容的错误响应，响应体在导入时预先序列化
+- load_json: 用 orjson 解析请求体
+- decode_body: 用 msgspec 解析并校验请求体（结构固定的请求体使用）
+- etag_response: 带 ETag 的 JSON 响应，If-None-Match 命中时返回 304
+"""
+
+import hashlib
+from typing import Any, Type, TypeVar
+
+import msgspec
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+T = TypeVar('T')
+
+
+async def load_json(request: Request):
+    """
+    解析 JSON 请求体（替代 request.json()）
+
+    orjson 直接解析 bytes，省去 UTF-8 解码；
+    解析失败抛出 orjson.JSONDecodeError（ValueError 子类），与 request.json() 一致。
+    """
+    return orjson.loads(await request.body())
+
+
+async def decode_body(request: Request, body_type: Type[T]) -> T:
+    """
+    解析并校验请求体（msgspec 单次完成解码与字段校验）
+
+    JSON 格式错误或字段缺失/类型不符时抛出 msgspec.DecodeError
+    （ValidationError 是其子类），调用方映射为 400。
+    """
+    return msgspec.json.decode(await request.body(), type=body_type)
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应体计算强 ETag（blake2b 128 位摘要）"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_response(request: Request, content: Any, max_age: int = 10) -> Response:
+    """
+    返回带 ETag 的 JSON 响应
+
+    客户端 If-None-Match 与当前 ETag 一致时直接返回 304，不再传输响应体。
+    """
+    body = orjson.dumps(content)
+    return cached_response(request, body, make_etag(body), max_age)
+
+
+def cached_response(request: Request, body: bytes, etag: str, max_age: int = 10) -> Response:
+    """用已序列化的响应体和 ETag 构造响应（调用方可自行缓存 body/etag）"""
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class StaticError:
+    """
+    预序列化的固定错误响应
+
+    响应体只编码一次；每次调用只构造一个新的轻量 Response。
+    不直接复用同一个 Response 实例，因为中间件（CORS 等）会原地修改响应头。
+    """
+
+    __slots__ = ('status_code', 'body')
+
+    def __init__(self, status_code: int, content: dict):
+        self.status_code = status_code
+        self.body = orjson.dumps(content)
+
+    def __call__(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type="application/json"
+        )
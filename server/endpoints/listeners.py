@@ -7,10 +7,11 @@ Listeners API 端点
 - 获取 Listener 统计信息
 """
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-router = APIRouter(prefix="/api/listeners", tags=["listeners"])
+router = APIRouter(prefix="/api/listeners", tags=["listeners"], default_response_class=ORJSONResponse)
 
 # 依赖注入
 listeners_manager = None
@@ -22,7 +23,7 @@ def set_dependencies(listeners):
     listeners_manager = listeners
 
 
-@router.get("")
+@router.get("", response_model=None)
 async def list_listeners():
     """
     获取所有 Listeners
@@ -35,42 +36,40 @@ async def list_listeners():
         listeners = listeners_manager.get_all_listeners()
         stats = listeners_manager.get_stats()
         
-        return {
+        return ORJSONResponse({
             "listeners": listeners,
             "stats": stats
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
 @router.get("/{listener_id}/logs")
-async def get_listener_logs(listener_id: str, limit: int = 50):
+async def get_listener_logs(listener_id: str, limit: int = Query(50, ge=1)):
     """
-    获取 Listener 日志
+    获取 Listener 日志（NDJSON 流式返回）
     
     参数:
         - listener_id: Listener ID
-        - limit: 返回数量（默认 50）
+        - limit: 返回数量（默认 50，至少 1）
     
     返回:
-        - logs: 日志列表
+        - application/x-ndjson: 每行一条日志（最新的在前）
     """
-    try:
-        log_writer = listeners_manager.get_log_writer()
-        logs = await log_writer.read_logs(listener_id, limit)
-        
-        return {"logs": logs}
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
-        )
+    # 文件读取在响应开始后才执行，读取失败由 iter_logs 记录日志并结束流
+    log_writer = listeners_manager.get_log_writer()
+    lines = (
+        orjson.dumps(entry) + b"\n"
+        async for entry in log_writer.iter_logs(listener_id, limit)
+    )
+    
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 
-@router.get("/stats/overview")
+@router.get("/stats/overview", response_model=None)
 async def get_listeners_stats():
     """
     获取 Listeners 统计信息
@@ -82,9 +81,9 @@ async def get_listeners_stats():
     """
     try:
         stats = listeners_manager.get_stats()
-        return stats
+        return ORJSONResponse(stats)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
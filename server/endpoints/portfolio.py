@@ -8,21 +8,47 @@ Portfolio API 端点
 - 生成投资建议
 """
 
-import json
-import sys
-from pathlib import Path
+import asyncio
+import logging
+from typing import Annotated, Optional
+import msgspec
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-
-# 添加项目路径
-sys.path.append(str(Path(__file__).parent.parent.parent))
+from fastapi.responses import ORJSONResponse, Response
 
 # 导入投资建议生成器
 from agent.custom_scripts.portfolio_advice_generator import generate_portfolio_advice
 # 导入投资审计服务
 from server.services.portfolio_audit import audit_portfolio_against_principles
+# 导入投资原则校验
+from database.schemas import validate_principles
+
+from server.endpoints.common import StaticError, decode_body
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/portfolio", tags=["portfolio"], default_response_class=ORJSONResponse)
+
+# 固定错误响应（预先序列化）
+_ERR_TEMPLATES = {
+    'portfolio_not_found': StaticError(404, {"error": "Portfolio not found"}),
+    'empty_portfolio': StaticError(400, {
+        "error": "Portfolio is empty. Please update your portfolio first.",
+        "hint": "Use PUT /api/portfolio to set your portfolio data"
+    }),
+}
+
+# 请求体模型（msgspec：解码与校验一次完成）
+class PortfolioUpdateRequest(msgspec.Struct, kw_only=True):
+    user_id: str = 'default'
+    portfolio: Annotated[dict, msgspec.Meta(min_length=1)]
+
+
+class AdviceRequest(msgspec.Struct, kw_only=True):
+    user_id: str = 'default'
+    report_id: Annotated[str, msgspec.Meta(min_length=1)]
+    principles_override: Optional[dict] = None
 
-router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
 # 依赖注入
 db_manager = None
@@ -34,6 +60,21 @@ def set_dependencies(db):
     db_manager = db
 
 
+def _drop_none_fields(portfolio: dict) -> dict:
+    """去掉持仓中值为 None 的字段（只裁剪不校验，写入路径接受的数据都能原样返回）"""
+    holdings = portfolio.get('holdings')
+    if not isinstance(holdings, list):
+        return portfolio
+    return {
+        **portfolio,
+        'holdings': [
+            {k: v for k, v in holding.items() if v is not None}
+            if isinstance(holding, dict) else holding
+            for holding in holdings
+        ],
+    }
+
+
 @router.get("")
 async def get_portfolio(user_id: str = 'default'):
     """
@@ -44,17 +85,17 @@ async def get_portfolio(user_id: str = 'default'):
     
     返回:
         - success: 是否成功
-        - data: 持仓数据
+        - data: 持仓数据（值为 null 的可选字段不返回）
     """
     try:
         portfolio = await db_manager.portfolio.get_or_create_default_portfolio(user_id)
         
-        return {
+        return ORJSONResponse({
             "success": True,
-            "data": portfolio
-        }
+            "data": _drop_none_fields(portfolio)
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -77,32 +118,28 @@ async def update_portfolio(request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
-        
-        user_id = data.get('user_id', 'default')
-        portfolio_data = data.get('portfolio')
-        
-        if not portfolio_data:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Missing required field: portfolio"}
-            )
+        body = await decode_body(request, PortfolioUpdateRequest)
         
         # 验证并更新持仓
-        await db_manager.portfolio.upsert_user_portfolio(user_id, portfolio_data)
+        await db_manager.portfolio.upsert_user_portfolio(body.user_id, body.portfolio)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": "Portfolio updated successfully"
-        }
+        })
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except ValueError as e:
         # 数据验证错误
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={"error": f"Portfolio validation failed: {str(e)}"}
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -124,17 +161,14 @@ async def delete_portfolio(user_id: str = 'default'):
         deleted = await db_manager.portfolio.delete_user_portfolio(user_id)
         
         if deleted:
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "message": "Portfolio deleted successfully"
-            }
+            })
         else:
-            return JSONResponse(
-                status_code=404,
-                content={"error": "Portfolio not found"}
-            )
+            return _ERR_TEMPLATES['portfolio_not_found']()
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -159,60 +193,53 @@ async def generate_advice(request: Request):
             - constraints_check: 原则检查结果
     """
     try:
-        data = await request.json()
+        body = await decode_body(request, AdviceRequest)
+        user_id = body.user_id
+        report_id = body.report_id
+        principles_override = body.principles_override
         
-        user_id = data.get('user_id', 'default')
-        report_id = data.get('report_id')
-        principles_override = data.get('principles_override')
-        
-        if not report_id:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Missing required field: report_id"}
-            )
+        # 1. 并发读取报告分析、持仓是否为空、投资原则（三者互不依赖）
+        analysis_raw, portfolio_empty, active_principles = await asyncio.gather(
+            db_manager.get_report_analysis_raw(report_id),
+            db_manager.portfolio.is_empty(user_id),
+            db_manager.principles.get_active_principles(user_id)
+            if not principles_override else asyncio.sleep(0, result=None)
+        )
         
-        # 1. 获取报告数据
-        report = await db_manager.get_report(report_id)
-        if not report:
-            return JSONResponse(
+        if analysis_raw is None:
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"Report '{report_id}' not found"}
             )
         
         # 解析报告分析 JSON
         try:
-            report_analysis = json.loads(report['analysis_json'])
-        except (json.JSONDecodeError, KeyError) as e:
-            return JSONResponse(
+            report_analysis = orjson.loads(analysis_raw)
+        except orjson.JSONDecodeError as e:
+            return ORJSONResponse(
                 status_code=500,
                 content={"error": f"Failed to parse report analysis: {str(e)}"}
             )
         
-        # 2. 获取用户持仓
+        # 2. 持仓为空时直接返回，非空才读取完整持仓（含 holdings 解析）
+        if portfolio_empty:
+            return _ERR_TEMPLATES['empty_portfolio']()
         portfolio = await db_manager.portfolio.get_or_create_default_portfolio(user_id)
-        
-        # 检查持仓是否为空
         if portfolio['total_asset_value'] == 0:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": "Portfolio is empty. Please update your portfolio first.",
-                    "hint": "Use PUT /api/portfolio to set your portfolio data"
-                }
-            )
+            # holdings_json 损坏时仓库回退为默认空持仓
+            return _ERR_TEMPLATES['empty_portfolio']()
         
-        # 3. 获取投资原则（优先使用 override）
+        # 3. 投资原则（优先使用 override）
         if principles_override:
-            from database.schemas import validate_principles
             try:
                 principles = validate_principles(principles_override)
             except ValueError as e:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=400,
                     content={"error": f"Invalid principles_override: {str(e)}"}
                 )
         else:
-            principles = await db_manager.principles.get_active_principles(user_id)
+            principles = active_principles
         
         # 4. 生成投资建议
         advice = await generate_portfolio_advice(
@@ -224,7 +251,7 @@ async def generate_advice(request: Request):
         
         # 5. 检查是否有错误
         if 'error' in advice:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=500,
                 content={
                     "error": "Failed to generate advice",
@@ -233,24 +260,27 @@ async def generate_advice(request: Request):
                 }
             )
         
-        return {
-            "success": True,
-            "data": advice
-        }
+        # 直接序列化，跳过 jsonable_encoder
+        return Response(
+            content=orjson.dumps({"success": True, "data": advice}),
+            media_type="application/json"
+        )
         
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except ValueError as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={"error": str(e)}
         )
     except Exception as e:
-        import traceback
-        return JSONResponse(
+        logger.exception("generate_advice failed")
+        return ORJSONResponse(
             status_code=500,
-            content={
-                "error": str(e),
-                "traceback": traceback.format_exc()
-            }
+            content={"error": str(e)}
         )
 
 
@@ -280,17 +310,14 @@ async def audit_portfolio(user_id: str = 'default'):
             user_id=user_id
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": audit_result
-        }
+        })
         
     except Exception as e:
-        import traceback
-        return JSONResponse(
+        logger.exception("audit_portfolio failed")
+        return ORJSONResponse(
             status_code=500,
-            content={
-                "error": str(e),
-                "traceback": traceback.format_exc()
-            }
+            content={"error": str(e)}
         )
@@ -7,10 +7,27 @@ Principles API 端点
 - 列出所有投资原则档案
 """
 
+from typing import Annotated
+
+import msgspec
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+
+from server.endpoints.common import decode_body, etag_response
+
+router = APIRouter(prefix="/api/principles", tags=["principles"], default_response_class=ORJSONResponse)
+
+# 请求体模型（msgspec：解码与校验一次完成）
+class PrinciplesUpdateRequest(msgspec.Struct, kw_only=True):
+    user_id: str = 'default'
+    principles: Annotated[dict, msgspec.Meta(min_length=1)]
+    is_active: bool = True
+
+
+class ActivatePrinciplesRequest(msgspec.Struct, kw_only=True):
+    user_id: Annotated[str, msgspec.Meta(min_length=1)]
+    profile_name: Annotated[str, msgspec.Meta(min_length=1)]
 
-router = APIRouter(prefix="/api/principles", tags=["principles"])
 
 # 依赖注入
 db_manager = None
@@ -23,7 +40,7 @@ def set_dependencies(db):
 
 
 @router.get("")
-async def get_principles(user_id: str = 'default'):
+async def get_principles(request: Request, user_id: str = 'default'):
     """
     获取用户当前激活的投资原则
     
@@ -37,12 +54,13 @@ async def get_principles(user_id: str = 'default'):
     try:
         principles = await db_manager.principles.get_active_principles(user_id)
         
-        return {
+        # 原则很少变化，前端轮询时通过 ETag 返回 304，省去响应体传输
+        return etag_response(request, {
             "success": True,
             "data": principles
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -63,12 +81,12 @@ async def list_principles(user_id: str = 'default'):
     try:
         principles_list = await db_manager.principles.list_user_principles(user_id)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": principles_list
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -93,37 +111,32 @@ async def update_principles(request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
-        
-        user_id = data.get('user_id', 'default')
-        principles_data = data.get('principles')
-        is_active = data.get('is_active', True)
-        
-        if not principles_data:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Missing required field: principles"}
-            )
+        body = await decode_body(request, PrinciplesUpdateRequest)
         
         # 验证并更新投资原则
         await db_manager.principles.upsert_user_principles(
-            user_id=user_id,
-            principles_data=principles_data,
-            is_active=is_active
+            user_id=body.user_id,
+            principles_data=body.principles,
+            is_active=body.is_active
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": "Principles updated successfully"
-        }
+        })
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except ValueError as e:
         # 数据验证错误
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={"error": f"Principles validation failed: {str(e)}"}
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -143,31 +156,29 @@ async def activate_principles(request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
-        
-        user_id = data.get('user_id')
-        profile_name = data.get('profile_name')
-        
-        if not user_id or not profile_name:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Missing required fields: user_id, profile_name"}
-            )
+        body = await decode_body(request, ActivatePrinciplesRequest)
+        user_id = body.user_id
+        profile_name = body.profile_name
         
         success = await db_manager.principles.set_active_principles(user_id, profile_name)
         
         if success:
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "message": f"Principles '{profile_name}' activated successfully"
-            }
+            })
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"Principles '{profile_name}' not found"}
             )
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -190,17 +201,17 @@ async def delete_principles(user_id: str = 'default', profile_name: str = None):
         deleted = await db_manager.principles.delete_user_principles(user_id, profile_name)
         
         if deleted:
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "message": "Principles deleted successfully"
-            }
+            })
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": "Principles not found"}
             )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
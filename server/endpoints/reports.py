@@ -8,13 +8,21 @@
 - 上传报告（新增）
 """
 
+import codecs
+import logging
 from fastapi import APIRouter, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from typing import Optional
+import time
 import uuid
 from datetime import datetime
+import orjson
 
-router = APIRouter(prefix="/api/reports", tags=["reports"])
+from server.endpoints.common import load_json
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/reports", tags=["reports"], default_response_class=ORJSONResponse)
 
 # 依赖注入（将在 server.py 中设置）
 db_manager = None
@@ -28,7 +36,53 @@ def set_dependencies(db, service):
     report_service = service
 
 
-@router.get("")
+# 上传文件按块读取并增量解码，限制单个文件大小
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+_UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+
+
+async def _read_upload_text(file: UploadFile) -> Optional[str]:
+    """
+    按块读取上传文件并增量 UTF-8 解码
+    
+    返回:
+        文件文本；超过 _UPLOAD_MAX_BYTES 时返回 None
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    parts = []
+    size = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > _UPLOAD_MAX_BYTES:
+            return None
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts)
+
+
+# 报告统计缓存（分页请求只需要 total，无需每页都跑一次聚合查询）
+_STATS_TTL = 5.0  # 秒
+_stats_cache = {"ts": 0.0, "val": None}
+
+
+async def _get_report_stats_cached():
+    """获取报告统计（TTL 内复用上次结果；上传报告后失效）"""
+    now = time.monotonic()
+    if _stats_cache["val"] is not None and now - _stats_cache["ts"] < _STATS_TTL:
+        return _stats_cache["val"]
+    stats = await db_manager.get_report_stats()
+    _stats_cache["val"] = stats
+    _stats_cache["ts"] = now
+    return stats
+
+
+def _invalidate_stats_cache():
+    """报告数量变化后清空统计缓存"""
+    _stats_cache["val"] = None
+    _stats_cache["ts"] = 0.0
+
+
+@router.get("", response_model=None)
 async def get_reports(limit: int = 20, offset: int = 0):
     """
     获取报告列表（分页）
@@ -46,23 +100,27 @@ async def get_reports(limit: int = 20, offset: int = 0):
     try:
         # 使用 search_reports 代替 get_all_reports
         reports = await db_manager.search_reports(limit=limit, offset=offset)
-        stats = await db_manager.get_report_stats()
+        stats = await _get_report_stats_cached()
         total = stats.get('total_reports', 0) if stats else 0
         
-        return {
-            "reports": reports,
-            "total": total,
-            "limit": limit,
-            "offset": offset
-        }
+        # 列表数据均为 JSON 原生类型，直接序列化，跳过 jsonable_encoder
+        return Response(
+            content=orjson.dumps({
+                "reports": reports,
+                "total": total,
+                "limit": limit,
+                "offset": offset
+            }),
+            media_type="application/json"
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
-@router.get("/{report_id}")
+@router.get("/{report_id}", response_model=None)
 async def get_report_details(report_id: str):
     """
     获取报告详情
@@ -77,20 +135,20 @@ async def get_report_details(report_id: str):
         report = await db_manager.get_report(report_id)
         
         if not report:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"Report {report_id} not found"}
             )
         
-        return {"report": report}
+        return ORJSONResponse({"report": report})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
-@router.post("/search")
+@router.post("/search", response_model=None)
 async def search_reports(request: Request):
     """
     搜索报告（智能选择搜索方式）
@@ -108,7 +166,7 @@ async def search_reports(request: Request):
         - count: 结果数量
     """
     try:
-        data = await request.json()
+        data = await load_json(request)
         query = data.get("query", "")
         category = data.get("category")
         action = data.get("action")
@@ -124,13 +182,16 @@ async def search_reports(request: Request):
             limit=limit
         )
         
-        return {
-            "results": results,
-            "query": query,
-            "count": len(results)
-        }
+        return Response(
+            content=orjson.dumps({
+                "results": results,
+                "query": query,
+                "count": len(results)
+            }),
+            media_type="application/json"
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -166,8 +227,12 @@ async def upload_report(
     try:
         # 如果上传了文件，读取内容
         if file:
-            file_content = await file.read()
-            content = file_content.decode('utf-8')
+            content = await _read_upload_text(file)
+            if content is None:
+                return ORJSONResponse(
+                    status_code=413,
+                    content={"error": f"File too large (max {_UPLOAD_MAX_BYTES // (1024 * 1024)}MB)"}
+                )
             if not title:
                 title = file.filename
         
@@ -177,8 +242,9 @@ async def upload_report(
             content=content,
             category=category
         )
+        _invalidate_stats_cache()
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "report_id": result['report_id'],
             "title": result['title'],
@@ -189,12 +255,11 @@ async def upload_report(
                 "summary": result.get('summary_one_sentence')
             },
             "message": f"Report '{title}' analyzed and saved successfully"
-        }
+        })
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return JSONResponse(
+        logger.exception("upload_report failed")
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": str(e),
@@ -203,7 +268,7 @@ async def upload_report(
         )
 
 
-@router.get("/stats/overview")
+@router.get("/stats/overview", response_model=None)
 async def get_report_stats():
     """
     获取报告统计信息
@@ -215,10 +280,10 @@ async def get_report_stats():
         - avg_importance: 平均重要性评分
     """
     try:
-        stats = await db_manager.get_report_stats()
-        return stats
+        stats = await _get_report_stats_cached()
+        return ORJSONResponse(stats)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -5,10 +5,16 @@
 - 基于意图识别的智能搜索接口
 """
 
+import logging
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
-router = APIRouter(prefix="/api/search", tags=["search"])
+from server.endpoints.common import load_json
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/search", tags=["search"], default_response_class=ORJSONResponse)
 
 # 依赖注入（将在 server.py 中设置）
 search_service = None
@@ -58,12 +64,12 @@ async def smart_search(request: Request):
         }
     """
     try:
-        data = await request.json()
+        data = await load_json(request)
         query = data.get("query", "")
         limit = data.get("limit", 10)
         
         if not query:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "error": "Query is required",
@@ -74,12 +80,12 @@ async def smart_search(request: Request):
         # 调用搜索服务的智能搜索方法
         result = await search_service.smart_search(query=query, limit=limit)
         
-        return result
+        # 直接序列化，跳过 jsonable_encoder
+        return Response(content=orjson.dumps(result), media_type="application/json")
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return JSONResponse(
+        logger.exception("smart_search failed")
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": str(e),
@@ -102,11 +108,11 @@ async def classify_intent(request: Request):
         - confidence: 置信度 (0.0-1.0)
     """
     try:
-        data = await request.json()
+        data = await load_json(request)
         query = data.get("query", "")
         
         if not query:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "error": "Query is required",
@@ -117,12 +123,11 @@ async def classify_intent(request: Request):
         # 调用意图识别服务
         result = await search_service.classify_intent(query)
         
-        return result
+        return ORJSONResponse(result)
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return JSONResponse(
+        logger.exception("classify_intent failed")
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": str(e),
@@ -8,10 +8,13 @@ UI State API 端点
 - 获取 UI State 模板列表
 """
 
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
-router = APIRouter(prefix="/api/ui-states", tags=["ui-states"])
+from server.endpoints.common import cached_response, load_json, make_etag
+
+router = APIRouter(prefix="/api/ui-states", tags=["ui-states"], default_response_class=ORJSONResponse)
 
 # 依赖注入
 ui_state_manager = None
@@ -23,6 +26,16 @@ def set_dependencies(ui_manager):
     ui_state_manager = ui_manager
 
 
+# 模板列表缓存（响应体 + ETag；模板只在热重载时变化）
+_templates_cache = None
+
+
+def invalidate_templates_cache():
+    """清空模板列表缓存（UI State 模板热重载后由 server.py 调用）"""
+    global _templates_cache
+    _templates_cache = None
+
+
 @router.get("")
 async def list_ui_states():
     """
@@ -33,9 +46,9 @@ async def list_ui_states():
     """
     try:
         states = await ui_state_manager.list_all_states()
-        return {"states": states}
+        return ORJSONResponse({"states": states})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -57,14 +70,14 @@ async def get_ui_state(state_id: str):
         state = await ui_state_manager.get_state(state_id)
         
         if state is None:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"State {state_id} not found"}
             )
         
-        return {"state_id": state_id, "data": state}
+        return ORJSONResponse({"state_id": state_id, "data": state})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -87,24 +100,24 @@ async def update_ui_state(state_id: str, request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
+        data = await load_json(request)
         
         await ui_state_manager.set_state(state_id, data)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "state_id": state_id,
             "message": f"Updated state {state_id}"
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
 
 @router.get("/templates/list")
-async def list_ui_state_templates():
+async def list_ui_state_templates(request: Request):
     """
     获取 UI State 模板列表
     
@@ -112,10 +125,13 @@ async def list_ui_state_templates():
         - templates: 模板列表
     """
     try:
-        templates = ui_state_manager.get_all_templates()
-        return {"templates": templates}
+        global _templates_cache
+        if _templates_cache is None:
+            body = orjson.dumps({"templates": ui_state_manager.get_all_templates()})
+            _templates_cache = (body, make_etag(body))
+        return cached_response(request, *_templates_cache)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -136,12 +152,12 @@ async def delete_ui_state(state_id: str):
     try:
         await ui_state_manager.delete_state(state_id)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": f"Deleted state {state_id}"
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
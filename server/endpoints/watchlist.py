@@ -8,10 +8,48 @@
 - 更新关注项
 """
 
+from typing import Annotated, List, Optional, Union
+
+import msgspec
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+
+from server.endpoints.common import decode_body, etag_response
+
+router = APIRouter(prefix="/api/watchlist", tags=["watchlist"], default_response_class=ORJSONResponse)
+
+# 请求体模型（msgspec：解码与校验一次完成）
+class WatchlistAddRequest(msgspec.Struct, kw_only=True):
+    target_name: Annotated[str, msgspec.Meta(min_length=1)]
+    target_type: str = "stock"
+    alert_conditions: Optional[dict] = None
+    notes: Optional[str] = None
+
+
+class WatchlistUpdateRequest(msgspec.Struct, kw_only=True):
+    # UNSET 表示请求体未包含该字段（不更新），None 表示显式清空
+    target_name: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    target_type: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    alert_conditions: Union[Optional[dict], msgspec.UnsetType] = msgspec.UNSET
+    status: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    notes: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+
+
+class WatchlistBulkUpdateItem(WatchlistUpdateRequest, kw_only=True):
+    id: int
+
+
+# 批量接口单次最多处理的条目数（同时低于 SQLite 变量数上限）
+_BULK_MAX_ITEMS = 500
+
+
+class WatchlistBulkRequest(msgspec.Struct, kw_only=True):
+    ids: Annotated[List[int], msgspec.Meta(max_length=_BULK_MAX_ITEMS)]
+
+
+class WatchlistBulkUpdateRequest(msgspec.Struct, kw_only=True):
+    items: Annotated[List[WatchlistBulkUpdateItem], msgspec.Meta(max_length=_BULK_MAX_ITEMS)]
 
-router = APIRouter(prefix="/api/watchlist", tags=["watchlist"])
 
 # 依赖注入
 db_manager = None
@@ -24,7 +62,7 @@ def set_dependencies(db):
 
 
 @router.get("")
-async def get_watchlist():
+async def get_watchlist(request: Request):
     """
     获取关注列表
     
@@ -33,9 +71,9 @@ async def get_watchlist():
     """
     try:
         watchlist = await db_manager.get_watchlist()
-        return {"watchlist": watchlist}
+        return etag_response(request, {"watchlist": watchlist})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -48,7 +86,7 @@ async def add_watchlist_item(request: Request):
     
     请求体:
         - target_name: 标的名称（必需）
-        - target_type: 标的类型（必需，如 ETF/stock/index/industry）
+        - target_type: 标的类型（可选，默认 stock，如 ETF/stock/index/industry）
         - alert_conditions: 提醒条件（可选，JSON 格式）
         - notes: 备注（可选）
     
@@ -58,22 +96,119 @@ async def add_watchlist_item(request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
+        body = await decode_body(request, WatchlistAddRequest)
         
         item_id = await db_manager.add_watchlist_item(
-            target_name=data.get("target_name"),
-            target_type=data.get("target_type"),
-            alert_conditions=data.get("alert_conditions"),
-            notes=data.get("notes")
+            target_name=body.target_name,
+            target_type=body.target_type,
+            alert_conditions=body.alert_conditions,
+            notes=body.notes
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "item_id": item_id,
-            "message": f"Added {data.get('target_name')} to watchlist"
-        }
+            "message": f"Added {body.target_name} to watchlist"
+        })
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+# 注意：批量路由必须声明在 /{item_id} 之前，否则 "bulk" 会被当作 item_id 匹配
+@router.post("/bulk")
+async def get_watchlist_items_bulk(request: Request):
+    """
+    批量获取关注项（一次请求 + 一次 IN 查询）
+    
+    请求体:
+        - ids: 关注项 ID 列表（最多 500 个）
+    
+    返回:
+        - items: 存在的关注项列表（不存在的 ID 直接忽略）
+    """
+    try:
+        body = await decode_body(request, WatchlistBulkRequest)
+        items = await db_manager.watchlist.get_items_bulk(body.ids)
+        return ORJSONResponse({"items": items})
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@router.put("/bulk")
+async def update_watchlist_items_bulk(request: Request):
+    """
+    批量更新关注项（同一事务）
+    
+    请求体:
+        - items: [{id, alert_conditions?, status?, notes?, ...}]（最多 500 个）
+    
+    返回:
+        - success: 是否成功
+        - updated: 实际更新的条目数
+    """
+    try:
+        body = await decode_body(request, WatchlistBulkUpdateRequest)
+        items = [
+            {
+                field: getattr(item, field)
+                for field in item.__struct_fields__
+                if getattr(item, field) is not msgspec.UNSET
+            }
+            for item in body.items
+        ]
+        updated = await db_manager.watchlist.update_items_bulk(items)
+        return ORJSONResponse({"success": True, "updated": updated})
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@router.post("/bulk/delete")
+async def delete_watchlist_items_bulk(request: Request):
+    """
+    批量删除关注项
+    
+    请求体:
+        - ids: 关注项 ID 列表（最多 500 个）
+    
+    返回:
+        - success: 是否成功
+        - deleted: 删除的条目数
+    """
+    try:
+        body = await decode_body(request, WatchlistBulkRequest)
+        deleted = await db_manager.watchlist.delete_items_bulk(body.ids)
+        return ORJSONResponse({"success": True, "deleted": deleted})
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -93,12 +228,12 @@ async def delete_watchlist_item(item_id: int):
     """
     try:
         await db_manager.delete_watchlist_item(item_id)
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": f"Deleted watchlist item {item_id}"
-        }
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -119,14 +254,14 @@ async def get_watchlist_item(item_id: int):
         item = await db_manager.get_watchlist_item(item_id)
         
         if not item:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"Watchlist item {item_id} not found"}
             )
         
-        return {"item": item}
+        return ORJSONResponse({"item": item})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -150,25 +285,37 @@ async def update_watchlist_item(item_id: int, request: Request):
         - message: 提示消息
     """
     try:
-        data = await request.json()
-        
-        success = await db_manager.update_watchlist_item(
-            item_id=item_id,
-            **data
-        )
+        body = await decode_body(request, WatchlistUpdateRequest)
+        updates = {
+            field: getattr(body, field)
+            for field in body.__struct_fields__
+            if getattr(body, field) is not msgspec.UNSET
+        }
+        if not updates:
+            return ORJSONResponse(
+                status_code=400,
+                content={"error": "no fields to update"}
+            )
+
+        success = await db_manager.watchlist.update_item(item_id, updates)
         
         if not success:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": f"Watchlist item {item_id} not found"}
             )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": f"Updated watchlist item {item_id}"
-        }
+        })
+    except msgspec.DecodeError as e:
+        return ORJSONResponse(
+            status_code=400,
+            content={"error": f"Invalid request body: {e}"}
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -0,0 +1,73 @@
+"""
+日志配置
+
+各模块通过 logging.getLogger(__name__) 记录日志。
+根 logger 只挂一个 QueueHandler，写 stdout 由 QueueListener 的后台线程完成，
+协程中记录日志不会阻塞在 stdout 锁和逐行 flush 上。
+队列满时直接丢弃新日志（背压），不拖慢请求处理。
+"""
+
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+LOG_QUEUE_SIZE = 10000
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """队列满时丢弃日志，而不是阻塞调用方"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """不在调用方线程格式化，消息拼接与异常堆栈渲染交给 QueueListener 线程"""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging(level: str = "INFO"):
+    """
+    配置根 logger（重复调用无副作用）
+
+    Args:
+        level: 日志级别（如 INFO / DEBUG）
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _queue_handler = _DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging():
+    """停止后台日志线程（会先写完队列中剩余的日志），并从根 logger 摘除 QueueHandler"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        # 先摘除 handler，避免之后的日志进入无人消费的队列
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
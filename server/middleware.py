@@ -0,0 +1,68 @@
+"""
+ASGI 中间件
+
+- FastCORS: 纯 ASGI 实现的 CORS（允许所有来源），替代 Starlette CORSMiddleware
+"""
+
+# 预检请求允许的方法（与 CORSMiddleware 的 allow_methods=["*"] 展开结果一致）
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+
+class FastCORS:
+    """
+    纯 ASGI CORS 中间件
+
+    行为与原配置 CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]) 一致：
+    - 带 credentials 时浏览器不接受 "*"，因此回显请求的 Origin
+    - 预检请求（OPTIONS + Access-Control-Request-Method）直接返回 200，不进入路由
+    - 没有 Origin 头的请求（非跨域）和 WebSocket 直接透传
+    """
+
+    def __init__(self, app, max_age: int = 600):
+        self.app = app
+        self.max_age = str(max_age).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+        # 预检请求：直接响应
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = cors_headers + [
+                (b"access-control-allow-methods", _ALLOW_METHODS),
+                (b"access-control-max-age", self.max_age),
+                (b"content-length", b"0"),
+            ]
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
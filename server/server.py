@@ -16,7 +16,12 @@ Finance Agent Server - FastAPI 主入口
 
 import os
 import sys
+import socket
 import asyncio
+import importlib
+import logging
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -29,9 +34,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # FastAPI 相关
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+import orjson
 
 # 环境变量
 from dotenv import load_dotenv
@@ -41,10 +47,13 @@ from ccsdk.websocket_handler import WebSocketHandler
 from ccsdk.listeners_manager import ListenersManager
 from ccsdk.actions_manager import ActionsManager
 from ccsdk.ui_state_manager import UIStateManager
+from ccsdk.hot_reload import HotReloadWatcher
 from database.database_manager import DatabaseManager
 
 # 服务层
 from server.services import ReportAnalysisService, SearchService
+from server.middleware import FastCORS
+from server.logging_config import setup_logging, shutdown_logging
 
 # API 端点路由
 from server.endpoints import (
@@ -70,11 +79,17 @@ DATABASE_PATH = os.getenv("DATABASE_PATH", "./data/finance.db")
 SERVER_PORT = int(os.getenv("SERVER_PORT", "3000"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 REPORT_DIR = os.getenv("REPORT_DIR", "./report")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))  # SQLite 读连接池大小（写操作由写锁串行化）
+SOCKET_BUFFER_SIZE = int(os.getenv("SOCKET_BUFFER_SIZE", str(4 * 1024 * 1024)))  # 监听套接字收发缓冲区（字节）
+
+# 日志经 QueueHandler 交给后台线程输出，协程内记录日志不阻塞
+setup_logging(LOG_LEVEL)
+logger = logging.getLogger(__name__)
 
 # 验证必需的环境变量
 if not ANTHROPIC_API_KEY:
-    print("⚠️  Warning: ANTHROPIC_AUTH_TOKEN not set in environment variables")
-    print("   Please set it in .env file or export it before starting the server")
+    logger.warning("⚠️  ANTHROPIC_AUTH_TOKEN not set in environment variables")
+    logger.warning("   Please set it in .env file or export it before starting the server")
 
 # ============================================================================
 # 创建 FastAPI 应用
@@ -86,98 +101,169 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",  # Swagger UI
     redoc_url="/api/redoc",  # ReDoc
+    default_response_class=ORJSONResponse,
 )
 
 # ============================================================================
 # CORS 配置（允许前端跨域访问）
 # ============================================================================
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 开发环境允许所有来源，生产环境应指定具体域名
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# 纯 ASGI 实现，等价于 CORSMiddleware 的全通配配置（开发环境允许所有来源，生产环境应指定具体域名）
+app.add_middleware(FastCORS)
 
 # ============================================================================
-# 初始化管理器（遵循正确的依赖顺序）
-# 顺序：DB → UIState → Actions → Listeners → WebSocket
+# 响应压缩（报告列表/搜索结果等 JSON 响应体积较大，1KB 以下不压缩）
 # ============================================================================
 
-print("🚀 Initializing Finance Agent Server...")
+# 必须在 FastCORS 之后注册：后注册的中间件位于外层，
+# 预检请求由 FastCORS 直接返回，不经过压缩；普通响应先加 CORS 头再压缩
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# ============================================================================
+# 管理器工厂（惰性单例，遵循正确的依赖顺序）
+# 顺序：DB → UIState → Actions → Listeners → WebSocket
+#
+# 导入本模块时不构造任何管理器（uvicorn 多进程 worker 在 fork 后各自构造），
+# 首次调用工厂函数时才实例化，之后由 lru_cache 返回同一实例。
+# startup_event 中统一预热并注入到端点模块。
+# ============================================================================
 
 # 1. 数据库管理器（最先初始化，单例模式）
-db_manager = DatabaseManager()
+@lru_cache(maxsize=1)
+def get_db_manager() -> DatabaseManager:
+    return DatabaseManager(db_path=DATABASE_PATH, pool_size=DB_POOL_SIZE)
+
 
 # 2. UI 状态管理器（依赖数据库）
-ui_state_manager = UIStateManager(db_manager)
+@lru_cache(maxsize=1)
+def get_ui_state_manager() -> UIStateManager:
+    return UIStateManager(get_db_manager())
+
 
 # 3. Actions 管理器（依赖数据库和 UI 状态）
-actions_manager = ActionsManager(db_manager, ui_state_manager)
+@lru_cache(maxsize=1)
+def get_actions_manager() -> ActionsManager:
+    return ActionsManager(get_db_manager(), get_ui_state_manager())
+
 
 # 4. Listeners 管理器（依赖最多）
-def notification_callback(notification: dict):
+async def notification_callback(notification: dict):
     """Listener 通知回调"""
-    print(f"[Server] Listener notification: {notification}")
+    logger.info("Listener notification: %s", notification)
     # TODO: 可以通过 WebSocket 广播通知到前端
 
-def log_broadcast_callback(log: dict):
-    """Listener 日志广播回调"""
-    # 通过 WebSocket 广播日志
-    asyncio.create_task(ws_handler.broadcast_listener_log(log))
+# Listener 日志批量广播：回调只负责入队，后台任务每 10ms 合并推送一次，
+# 避免日志密集时每条日志都创建一个广播任务
+LISTENER_LOG_FLUSH_INTERVAL = 0.01
+_listener_log_queue: deque = deque(maxlen=1000)  # 客户端跟不上时丢弃最旧日志
+_listener_log_event = asyncio.Event()
+_listener_log_task: Optional[asyncio.Task] = None
+
+async def log_broadcast_callback(log: dict):
+    """Listener 日志广播回调（入队，由 flush_listener_logs 批量发送）"""
+    _listener_log_queue.append(log)
+    _listener_log_event.set()
+
+async def flush_listener_logs():
+    """后台任务：等待新日志，攒够一个时间窗口后通过 WebSocket 批量广播"""
+    while True:
+        await _listener_log_event.wait()
+        await asyncio.sleep(LISTENER_LOG_FLUSH_INTERVAL)
+        _listener_log_event.clear()
+        
+        batch = list(_listener_log_queue)
+        _listener_log_queue.clear()
+        try:
+            await get_ws_handler().broadcast_listener_logs(batch)
+        except Exception as e:
+            logger.error("❌ Error broadcasting listener logs: %s", e)
+
+@lru_cache(maxsize=1)
+def get_listeners_manager() -> ListenersManager:
+    return ListenersManager(
+        database=get_db_manager(),
+        notification_callback=notification_callback,
+        log_broadcast_callback=log_broadcast_callback,
+        ui_state_manager=get_ui_state_manager()
+    )
 
-listeners_manager = ListenersManager(
-    database=db_manager,
-    notification_callback=notification_callback,
-    log_broadcast_callback=log_broadcast_callback,
-    ui_state_manager=ui_state_manager
-)
 
-# 5. WebSocket 处理器（整合所有管理器）
-ws_handler = WebSocketHandler(
-    db_manager=db_manager,
-    ui_state_manager=ui_state_manager,
-    search_service=None  # ✅ 暂时为 None，后面注入
-)
+# 5. 搜索服务
+@lru_cache(maxsize=1)
+def get_search_service() -> SearchService:
+    return SearchService(
+        database_manager=get_db_manager()
+    )
 
-# 将 ActionsManager 和 ListenersManager 注入到 WebSocketHandler
-# （用于处理 execute_action 消息）
-ws_handler.actions_manager = actions_manager
-ws_handler.listeners_manager = listeners_manager
 
-# 6. 报告分析服务
-report_service = ReportAnalysisService(
-    database_manager=db_manager,
-    listeners_manager=listeners_manager
-)
-
-# 7. 搜索服务
-search_service = SearchService(
-    database_manager=db_manager
-)
+# 6. WebSocket 处理器（整合所有管理器）
+@lru_cache(maxsize=1)
+def get_ws_handler() -> WebSocketHandler:
+    ws_handler = WebSocketHandler(
+        db_manager=get_db_manager(),
+        ui_state_manager=get_ui_state_manager(),
+        search_service=get_search_service()
+    )
+    # 将 ActionsManager 和 ListenersManager 注入到 WebSocketHandler
+    # （用于处理 execute_action 消息）
+    ws_handler.actions_manager = get_actions_manager()
+    ws_handler.listeners_manager = get_listeners_manager()
+    return ws_handler
+
+
+# 7. 报告分析服务
+@lru_cache(maxsize=1)
+def get_report_service() -> ReportAnalysisService:
+    return ReportAnalysisService(
+        database_manager=get_db_manager(),
+        listeners_manager=get_listeners_manager()
+    )
 
-# ✅ 注入 search_service 到 WebSocketHandler
-ws_handler.search_service = search_service
 
-print("✅ Managers initialized successfully")
+def init_managers():
+    """构造全部管理器并注入到端点模块（startup_event 中调用一次）"""
+    logger.info("🚀 Initializing Finance Agent Server...")
+    
+    db_manager = get_db_manager()
+    get_ws_handler()
+    
+    reports_endpoint.set_dependencies(db_manager, get_report_service())
+    watchlist_endpoint.set_dependencies(db_manager)
+    portfolio_endpoint.set_dependencies(db_manager)
+    principles_endpoint.set_dependencies(db_manager)
+    ui_states_endpoint.set_dependencies(get_ui_state_manager())
+    actions_endpoint.set_dependencies(get_actions_manager())
+    listeners_endpoint.set_dependencies(get_listeners_manager())
+    search_endpoint.set_dependencies(get_search_service())
+    
+    logger.info("✅ Managers initialized successfully")
 
 # ============================================================================
-# 依赖注入到端点模块
+# 服务器生命周期事件
 # ============================================================================
 
-reports_endpoint.set_dependencies(db_manager, report_service)
-watchlist_endpoint.set_dependencies(db_manager)
-portfolio_endpoint.set_dependencies(db_manager)
-principles_endpoint.set_dependencies(db_manager)
-ui_states_endpoint.set_dependencies(ui_state_manager)
-actions_endpoint.set_dependencies(actions_manager)
-listeners_endpoint.set_dependencies(listeners_manager)
-search_endpoint.set_dependencies(search_service)
+# 插件热重载：一个 watchdog Observer 监听全部插件目录，按目录分发重载
+hot_reload_watcher = HotReloadWatcher()
+
+
+async def reload_listeners():
+    """Listeners 目录变化：重新加载"""
+    listeners = await get_listeners_manager().load_all_listeners()
+    logger.info("🔄 [Hot Reload] Listeners reloaded: %d listener(s)", len(listeners))
+
+
+async def reload_actions():
+    """Actions 目录变化：重新加载"""
+    templates = await get_actions_manager().load_all_templates()
+    logger.info("🔄 [Hot Reload] Actions reloaded: %d template(s)", len(templates))
+
+
+async def reload_ui_states():
+    """UI States 目录变化：重新加载并清空模板列表缓存"""
+    templates = await get_ui_state_manager().load_all_templates()
+    ui_states_endpoint.invalidate_templates_cache()
+    logger.info("🔄 [Hot Reload] UI States reloaded: %d template(s)", len(templates))
 
-# ============================================================================
-# 服务器生命周期事件
-# ============================================================================
 
 @app.on_event("startup")
 async def startup_event():
@@ -185,88 +271,82 @@ async def startup_event():
     服务器启动时的异步初始化
     对应 Email Agent 的 server.ts 第 74-129 行
     """
-    print("\n" + "=" * 60)
-    print("🔧 Starting Finance Agent Server - Async Initialization")
-    print("=" * 60)
+    logger.info("🔧 Starting Finance Agent Server - Async Initialization")
     
     try:
-        # 1. 数据库已在初始化时完成 schema 加载
-        print("\n[1/5] Database initialization...")
-        stats = await db_manager.get_report_stats()
-        report_count = stats.get('total_reports', 0) if stats else 0
-        print(f"   ✅ Database ready: {report_count} reports indexed")
-        
-        # 2. 加载 Listeners
-        print("\n[2/5] Loading listeners...")
-        listeners = await listeners_manager.load_all_listeners()
-        print(f"   ✅ Loaded {len(listeners)} listener(s)")
+        init_managers()
+        db_manager = get_db_manager()
+        listeners_manager = get_listeners_manager()
+        actions_manager = get_actions_manager()
+        ui_state_manager = get_ui_state_manager()
         
-        # 3. 加载 Actions
-        print("\n[3/5] Loading actions...")
-        actions = await actions_manager.load_all_templates()
-        print(f"   ✅ Loaded {len(actions)} action template(s)")
-        
-        # 4. 加载 UI States
-        print("\n[4/5] Loading UI states...")
-        ui_states = await ui_state_manager.load_all_templates()
-        print(f"   ✅ Loaded {len(ui_states)} UI state template(s)")
-        
-        # 5. 启动热重载（文件监听）
-        print("\n[5/5] Starting hot reload watchers...")
-        
-        # Listeners 热重载
-        asyncio.create_task(
-            listeners_manager.watch_listeners(
-                lambda ls: print(f"   🔄 [Hot Reload] Listeners reloaded: {len(ls)} listener(s)")
-            )
+        # 1-2. 数据库统计查询与 Listeners / Actions / UI States 加载互不依赖，并发执行
+        #      （数据库已在初始化时完成 schema 加载；查询在 aiosqlite 线程中运行时，插件在事件循环中加载）
+        logger.info("[1/4] Database initialization...")
+        logger.info("[2/4] Loading listeners, actions and UI states...")
+        stats, listeners, actions, ui_states = await asyncio.gather(
+            db_manager.get_report_stats(),
+            listeners_manager.load_all_listeners(),
+            actions_manager.load_all_templates(),
+            ui_state_manager.load_all_templates()
         )
+        report_count = stats.get('total_reports', 0) if stats else 0
+        logger.info("   ✅ Database ready: %d reports indexed", report_count)
+        logger.info("   ✅ Loaded %d listener(s)", len(listeners))
+        logger.info("   ✅ Loaded %d action template(s)", len(actions))
+        logger.info("   ✅ Loaded %d UI state template(s)", len(ui_states))
         
-        # Actions 热重载
-        asyncio.create_task(
-            actions_manager.watch_templates(
-                lambda ts: print(f"   🔄 [Hot Reload] Actions reloaded: {len(ts)} template(s)")
-            )
-        )
+        # 3. 预热搜索服务（嵌入模型等）
+        logger.info("[3/4] Warming up search service...")
+        await get_search_service().warmup()
+        logger.info("   ✅ Search service ready")
         
-        # UI States 热重载
-        asyncio.create_task(
-            ui_state_manager.watch_templates(
-                lambda ts: print(f"   🔄 [Hot Reload] UI States reloaded: {len(ts)} template(s)")
-            )
-        )
+        # 4. 启动热重载（文件监听）
+        logger.info("[4/4] Starting hot reload watcher...")
+        hot_reload_watcher.register(listeners_manager.listeners_dir, reload_listeners)
+        hot_reload_watcher.register(actions_manager.actions_dir, reload_actions)
+        hot_reload_watcher.register(ui_state_manager.ui_states_dir, reload_ui_states)
+        if hot_reload_watcher.start():
+            logger.info("   ✅ Hot reload watcher started")
         
-        print("   ✅ Hot reload watchers started")
+        # Listener 日志批量广播
+        global _listener_log_task
+        _listener_log_task = asyncio.create_task(flush_listener_logs())
         
         # 启动成功信息
-        print("\n" + "=" * 60)
-        print("✅ Finance Agent Server Started Successfully!")
-        print("=" * 60)
-        print(f"\n📡 Server listening on: http://localhost:{SERVER_PORT}")
-        print(f"🔌 WebSocket endpoint: ws://localhost:{SERVER_PORT}/ws")
-        print(f"📚 API documentation: http://localhost:{SERVER_PORT}/api/docs")
-        print(f"📊 Database: {DATABASE_PATH}")
-        print(f"📁 Report directory: {REPORT_DIR}")
-        print("\n" + "=" * 60 + "\n")
+        logger.info("✅ Finance Agent Server Started Successfully!")
+        logger.info("📡 Server listening on: http://localhost:%d", SERVER_PORT)
+        logger.info("🔌 WebSocket endpoint: ws://localhost:%d/ws", SERVER_PORT)
+        logger.info("📚 API documentation: http://localhost:%d/api/docs", SERVER_PORT)
+        logger.info("📊 Database: %s", DATABASE_PATH)
+        logger.info("📁 Report directory: %s", REPORT_DIR)
         
     except Exception as e:
-        print(f"\n❌ Failed to start server: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Failed to start server: %s", e)
         raise
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """服务器关闭时的清理"""
-    print("\n🛑 Shutting down Finance Agent Server...")
+    logger.info("🛑 Shutting down Finance Agent Server...")
+    
+    # 停止热重载监听
+    hot_reload_watcher.stop()
+    
+    # 等待后台 Listener 任务结束（它们会使用数据库连接和 WebSocket 广播）
+    await get_report_service().aclose()
     
-    # 停止 WebSocket Handler
-    await ws_handler.stop()
+    # 停止日志广播任务和 WebSocket Handler
+    if _listener_log_task:
+        _listener_log_task.cancel()
+    await get_ws_handler().stop()
     
-    # DatabaseManager 使用 aiosqlite，不需要显式关闭
-    # 每次操作都是独立的连接上下文
+    # 关闭数据库连接池中的长连接
+    await get_db_manager().aclose()
     
-    print("✅ Server shutdown complete\n")
+    logger.info("✅ Server shutdown complete")
+    shutdown_logging()
 
 # ============================================================================
 # 全局异常处理器
@@ -275,11 +355,9 @@ async def shutdown_event():
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """全局异常处理器"""
-    print(f"❌ Unhandled error: {exc}")
-    import traceback
-    traceback.print_exc()
+    logger.error("❌ Unhandled error: %s", exc, exc_info=exc)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": str(exc),
@@ -305,6 +383,7 @@ async def websocket_endpoint(websocket: WebSocket):
     - Listener 日志广播
     """
     await websocket.accept()
+    ws_handler = get_ws_handler()
     
     # 调用 WebSocketHandler 的 on_open 方法
     await ws_handler.on_open(websocket)
@@ -319,7 +398,7 @@ async def websocket_endpoint(websocket: WebSocket):
         # 客户端断开连接
         await ws_handler.on_close(websocket)
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
+        logger.error("❌ WebSocket error: %s", e)
         await ws_handler.on_close(websocket)
 
 # ============================================================================
@@ -339,38 +418,108 @@ app.include_router(search_endpoint.router)
 
 # ---------- 健康检查 ----------
 
+# 固定内容的响应体在启动时序列化一次，请求时直接返回字节
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "finance-agent",
+    "version": "1.0.0"
+})
+
+_ROOT_BODY = orjson.dumps({
+    "message": "Finance Agent API",
+    "docs": "/api/docs",
+    "websocket": "/ws"
+})
+
+
 @app.get("/health")
 async def health_check():
     """健康检查端点"""
-    return {
-        "status": "healthy",
-        "service": "finance-agent",
-        "version": "1.0.0"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """根路径"""
-    return {
-        "message": "Finance Agent API",
-        "docs": "/api/docs",
-        "websocket": "/ws"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 # ============================================================================
 # 主入口
 # ============================================================================
 
+def create_listen_socket(host: str, port: int) -> "socket.socket":
+    """
+    预先创建并绑定监听套接字（生产模式交给 uvicorn 使用）
+    
+    Linux 上 accept 得到的连接会继承监听套接字的选项：
+    - TCP_NODELAY: 关闭 Nagle 算法，WebSocket 小帧（日志、UI 状态）立即发出
+    - SO_SNDBUF/SO_RCVBUF: 放大收发缓冲区，大报告响应不被默认缓冲区限速
+      （实际上限受 net.core.wmem_max/rmem_max 约束，见 scripts/tune_network.sh）
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+# io_uring 需要 5.11+ 内核（IORING_FEAT_FAST_POLL 等网络特性）
+IO_URING_MIN_KERNEL = (5, 11)
+
+
+def select_event_loop() -> str:
+    """
+    选择 uvicorn 事件循环（返回 uvicorn 的 loop 参数）
+    
+    - EVENT_LOOP_POLICY=模块:类（如某个 io_uring 事件循环策略）且内核 >= 5.11：
+      安装该策略并返回 "none"，由 uvicorn 沿用当前策略
+    - 否则返回 "auto"：uvloop 已安装时使用 uvloop，未安装时回退到标准 asyncio
+    
+    自动重载模式下服务运行在 uvicorn 子进程中，这里安装的策略不会生效，因此仅用于非开发模式。
+    """
+    policy_path = os.getenv("EVENT_LOOP_POLICY")
+    if policy_path and sys.platform == "linux":
+        release = os.uname().release.split("-")[0].split(".")
+        kernel = tuple(int(part) for part in release[:2] if part.isdigit())
+        if kernel >= IO_URING_MIN_KERNEL:
+            module_name, _, class_name = policy_path.partition(":")
+            try:
+                policy_class = getattr(importlib.import_module(module_name), class_name)
+                asyncio.set_event_loop_policy(policy_class())
+                logger.info("⚡ Event loop policy: %s", policy_path)
+                return "none"
+            except (ImportError, AttributeError) as e:
+                logger.warning("⚠️  Failed to load EVENT_LOOP_POLICY=%s: %s, falling back", policy_path, e)
+        else:
+            logger.warning("⚠️  Kernel %s < 5.11, ignoring EVENT_LOOP_POLICY", os.uname().release)
+    
+    return "auto"
+
+
 if __name__ == "__main__":
     import uvicorn
     
-    # 启动服务器
-    uvicorn.run(
-        "server.server:app",
-        host="0.0.0.0",
+    # 开发模式（ENV=dev）才启用自动重载和访问日志
+    is_dev = os.getenv("ENV") == "dev"
+    host = "0.0.0.0"
+    
+    # 事件循环见 select_event_loop；httptools 解析器由 uvicorn[standard] 提供
+    uvicorn_options = dict(
+        host=host,
         port=SERVER_PORT,
-        reload=True,  # 开发模式自动重载
+        loop="auto" if is_dev else select_event_loop(),
+        http="httptools",
+        ws="websockets",
         log_level=LOG_LEVEL.lower(),
-        access_log=True
+        access_log=is_dev
     )
+    
+    if is_dev:
+        # 自动重载模式由 uvicorn 监督进程自行绑定端口
+        uvicorn.run("server.server:app", reload=True, **uvicorn_options)
+    else:
+        config = uvicorn.Config("server.server:app", **uvicorn_options)
+        uvicorn.Server(config).run(sockets=[create_listen_socket(host, SERVER_PORT)])
@@ -7,20 +7,30 @@
 - 触发 Listeners
 """
 
+import asyncio
+import logging
 import uuid
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 import sys
 
-# 导入 report_analyzer 的核心函数
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+# 导入 report_analyzer 的核心函数（项目根目录只加入 sys.path 一次）
+_PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 from agent.custom_scripts.listeners.report_analyzer import (
     _analyze_report_with_ai,
     _transform_to_db_format
 )
 
+logger = logging.getLogger(__name__)
+
+# 后台并发执行 Listeners 的上限
+_LISTENER_CONCURRENCY = 8
+# 关闭服务时等待后台 Listener 任务的最长时间（秒），超时后取消
+_LISTENER_SHUTDOWN_TIMEOUT = 10.0
+
 
 class ReportAnalysisService:
     """报告分析服务"""
@@ -36,6 +46,10 @@ class ReportAnalysisService:
         self.db = database_manager
         self.listeners_manager = listeners_manager
         # 不再需要 AgentTools，直接调用 report_analyzer 的函数
+        
+        # Listeners 在后台执行，不阻塞上传响应；保留任务引用防止被垃圾回收
+        self._listener_sem = asyncio.Semaphore(_LISTENER_CONCURRENCY)
+        self._listener_tasks = set()
     
     async def analyze_and_save_report(
         self,
@@ -58,11 +72,11 @@ class ReportAnalysisService:
         """
         
         # 1. 调用 report_analyzer 的核心分析逻辑
-        print(f"[ReportService] 开始分析报告: {title}")
+        logger.info("开始分析报告: %s", title)
         analysis_result = await _analyze_report_with_ai(content, depth="standard")
         
         if "error" in analysis_result:
-            print(f"[ReportService] ⚠️ AI 分析失败: {analysis_result['error']}")
+            logger.warning("⚠️ AI 分析失败: %s", analysis_result['error'])
             return {
                 'success': False,
                 'error': analysis_result['error']
@@ -81,14 +95,14 @@ class ReportAnalysisService:
             report_data['category'] = category
         
         # 4. 保存到数据库
-        print(f"[ReportService] 保存报告到数据库: {report_data['report_id']}")
+        logger.info("保存报告到数据库: %s", report_data['report_id'])
         await self.db.upsert_report(report_data)
         
-        # 5. 触发 Listeners（带 skip_analysis 标记，避免重复分析）
+        # 5. 后台触发 Listeners（带 skip_analysis 标记，避免重复分析）
         if self.listeners_manager:
-            await self._trigger_listeners(report_data, skip_analysis=True)
+            self._schedule_listeners(report_data, skip_analysis=True)
         
-        print(f"[ReportService] ✅ 报告分析完成: {report_data['report_id']}")
+        logger.info("✅ 报告分析完成: %s", report_data['report_id'])
         
         return {
             'report_id': report_data['report_id'],
@@ -100,7 +114,43 @@ class ReportAnalysisService:
             'category': report_data['category']
         }
     
-
+    def _schedule_listeners(self, report_data: Dict[str, Any], skip_analysis: bool = False):
+        """
+        在后台任务中触发 Listeners（最多 _LISTENER_CONCURRENCY 个并发）
+        
+        报告已入库，调用方无需等待 Listeners 执行完毕即可返回
+        """
+        async def _run():
+            async with self._listener_sem:
+                await self._trigger_listeners(report_data, skip_analysis=skip_analysis)
+        
+        task = asyncio.create_task(_run())
+        self._listener_tasks.add(task)
+        task.add_done_callback(self._on_listener_task_done)
+    
+    def _on_listener_task_done(self, task: asyncio.Task):
+        """后台 Listener 任务结束：释放引用并输出未捕获的异常"""
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("⚠️ 后台 Listener 任务异常", exc_info=task.exception())
+    
+    async def aclose(self, timeout: float = _LISTENER_SHUTDOWN_TIMEOUT):
+        """
+        等待后台 Listener 任务结束（服务器关闭、数据库连接池关闭之前调用）
+        
+        超过 timeout 仍未完成的任务会被取消，避免在连接池关闭后继续使用连接
+        """
+        if not self._listener_tasks:
+            return
+        
+        tasks = list(self._listener_tasks)
+        logger.info("⏳ 等待 %d 个后台 Listener 任务结束...", len(tasks))
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logger.warning("⚠️ %d 个后台 Listener 任务超时，已取消", len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
     
     async def _trigger_listeners(self, report_data: Dict[str, Any], skip_analysis: bool = False):
         """
@@ -123,7 +173,7 @@ class ReportAnalysisService:
                     "skip_analysis": skip_analysis  # 新增：告诉 Listener 跳过分析
                 }
             )
-            print(f"[ReportService] ✅ 已触发 Listeners: report_added (skip_analysis={skip_analysis})")
+            logger.info("✅ 已触发 Listeners: report_added (skip_analysis=%s)", skip_analysis)
         
         except Exception as e:
-            print(f"[ReportService] ⚠️ 触发 Listeners 失败: {e}")
+            logger.warning("⚠️ 触发 Listeners 失败: %s", e)
@@ -6,11 +6,44 @@
 - 智能路由：根据意图选择本地数据库搜索或网络搜索
 """
 
-import json
+import asyncio
+import logging
 import re
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Tuple
+
+import orjson
+
 from ccsdk.ai_client import AIClient
 
+logger = logging.getLogger(__name__)
+
+# 意图识别结果缓存：相同查询在 TTL 内直接复用，跳过一次 LLM 调用
+_INTENT_CACHE_TTL = 600      # 秒
+_INTENT_CACHE_SIZE = 1024    # 最多缓存的查询数
+_INTENT_KEY_MAX_LEN = 256    # 缓存键截断长度
+
+# 意图识别提示词（在用户查询处拆成前后两段，调用时直接拼接）
+_INTENT_PREFIX = """
+            你是一个智能金融助手。请分析以下用户查询，并将其分类为以下三类之一：
+            1. PORTFOLIO: 关于用户自己的投资组合、资产配置、持仓检查、合规性审计或投资原则的一致性检查。
+            2. FINANCE: 关于市场研报、股票基金分析、宏观经济趋势或具体金融数据的外部知识库查询。
+            3. GENERAL: 关于常识、天气、非金融新闻、闲聊或通用的网络信息查询。
+
+            用户查询: \""""
+_INTENT_SUFFIX = """\"
+
+            请仅返回一个 JSON 对象，格式如下：
+            {
+              "intent": "PORTFOLIO" | "FINANCE" | "GENERAL",
+              "reason": "分类理由的简短说明",
+              "confidence": 0.0 到 1.0 之间的置信度
+            }
+            """
+
+# 从 LLM 文本输出中提取 JSON 对象
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class SearchService:
     """智能搜索服务"""
@@ -24,6 +57,25 @@ class SearchService:
         """
         self.db = database_manager
         self.ai_client = AIClient()
+        # 归一化查询 → (写入时间, 意图结果)；dict 保持插入顺序，首个键即最旧条目
+        self._intent_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    async def warmup(self) -> None:
+        """
+        预热搜索依赖（服务器启动时调用一次）
+        
+        向量搜索启用时，对嵌入模型做一次前向计算，
+        避免第一个 FINANCE 查询承担模型加载和算子初始化的耗时。
+        """
+        embedding_function = getattr(self.db, 'embedding_function', None)
+        if not getattr(self.db, 'chroma_client', None) or embedding_function is None:
+            return
+        
+        try:
+            await asyncio.to_thread(embedding_function, ["warmup"])
+            logger.info("✅ 嵌入模型预热完成")
+        except Exception as e:
+            logger.warning("⚠️ 嵌入模型预热失败: %s", e)
     
     async def classify_intent(self, query: str) -> Dict[str, Any]:
         """
@@ -35,22 +87,15 @@ class SearchService:
         Returns:
             Dict: 包含 intent (PORTFOLIO/FINANCE/GENERAL), reason, confidence
         """
-        print(f"\n[SearchService] 🎯 正在识别意图: '{query}'")
-        prompt = f"""
-            你是一个智能金融助手。请分析以下用户查询，并将其分类为以下三类之一：
-            1. PORTFOLIO: 关于用户自己的投资组合、资产配置、持仓检查、合规性审计或投资原则的一致性检查。
-            2. FINANCE: 关于市场研报、股票基金分析、宏观经济趋势或具体金融数据的外部知识库查询。
-            3. GENERAL: 关于常识、天气、非金融新闻、闲聊或通用的网络信息查询。
-
-            用户查询: "{query}"
-
-            请仅返回一个 JSON 对象，格式如下：
-            {{
-              "intent": "PORTFOLIO" | "FINANCE" | "GENERAL",
-              "reason": "分类理由的简短说明",
-              "confidence": 0.0 到 1.0 之间的置信度
-            }}
-            """
+        cache_key = query.strip().lower()[:_INTENT_KEY_MAX_LEN]
+        cached = self._intent_cache.get(cache_key)
+        if cached is not None and time.time() - cached[0] < _INTENT_CACHE_TTL:
+            logger.info("⚡ 意图缓存命中: %s", cached[1].get('intent'))
+            # 返回浅拷贝，调用方修改结果不会污染缓存
+            return dict(cached[1])
+        
+        logger.info("🎯 正在识别意图: '%s'", query)
+        prompt = _INTENT_PREFIX + query + _INTENT_SUFFIX
         
         try:
             # 使用较轻量的配置进行单次意图识别
@@ -65,29 +110,37 @@ class SearchService:
             for msg in result.get('messages', []):
                 if msg.type == 'assistant':
                     # 尝试从文本中提取 JSON
-                    text = ""
                     if isinstance(msg.content, list):
-                        for block in msg.content:
-                            if block.get('type') == 'text':
-                                text += block.get('text', '')
+                        text = ''.join(
+                            block.get('text', '') for block in msg.content
+                            if block.get('type') == 'text'
+                        )
                     else:
                         text = str(msg.content)
                     
-                    json_match = re.search(r'\{.*\}', text, re.DOTALL)
+                    json_match = _JSON_BLOCK_RE.search(text)
                     if json_match:
                         try:
-                            intent_result = json.loads(json_match.group())
-                            print(f"[SearchService] ✅ 识别结果: {intent_result.get('intent')} (理由: {intent_result.get('reason')})")
+                            intent_result = orjson.loads(json_match.group())
+                            logger.info("✅ 识别结果: %s (理由: %s)", intent_result.get('intent'), intent_result.get('reason'))
+                            self._store_intent(cache_key, intent_result)
                             return intent_result
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             continue
             
             return {"intent": "GENERAL", "reason": "无法解析 AI 响应", "confidence": 0.0}
             
         except Exception as e:
-            print(f"[SearchService] ⚠️ 意图识别失败: {e}")
+            logger.warning("⚠️ 意图识别失败: %s", e)
             return {"intent": "GENERAL", "reason": str(e), "confidence": 0.0}
     
+    def _store_intent(self, cache_key: str, intent_result: Dict[str, Any]):
+        """写入意图缓存（只缓存成功解析的结果的副本），超出容量时淘汰最旧条目"""
+        self._intent_cache.pop(cache_key, None)
+        if len(self._intent_cache) >= _INTENT_CACHE_SIZE:
+            self._intent_cache.pop(next(iter(self._intent_cache)))
+        self._intent_cache[cache_key] = (time.time(), dict(intent_result))
+    
     async def smart_search(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """
         智能搜索：根据意图选择搜索方式
@@ -103,7 +156,7 @@ class SearchService:
         intent_data = await self.classify_intent(query)
         intent = intent_data.get("intent", "GENERAL")
         
-        print(f"[SearchService] 🔍 意图识别结果: {intent} (置信度: {intent_data.get('confidence')})")
+        logger.info("🔍 意图识别结果: %s (置信度: %s)", intent, intent_data.get('confidence'))
         
         results = []
         search_type = "unknown"
@@ -111,12 +164,12 @@ class SearchService:
         # 2. 根据意图执行不同的搜索
         if intent == "FINANCE":
             # 金融意图：执行本地数据库搜索
-            print(f"[SearchService] 🏦 执行本地数据库搜索...")
+            logger.info("🏦 执行本地数据库搜索...")
             results = await self.db.smart_search_reports(query=query, limit=limit)
             search_type = "local_database"
         else:
             # 通用意图：执行网络搜索
-            print(f"[SearchService] 🌐 执行网络搜索...")
+            logger.info("🌐 执行网络搜索...")
             # 使用较通用的提示词，允许直接网络搜索
             options = {
                 "system_prompt": "你是一个通用的AI助手。请通过网络搜索回答用户的问题。不要尝试在本地数据库中搜索。",
@@ -127,11 +180,11 @@ class SearchService:
             # 提取回答内容作为搜索结果
             for msg in search_result.get('messages', []):
                 if msg.type == 'assistant':
-                    text = ""
                     if isinstance(msg.content, list):
-                        for block in msg.content:
-                            if block.get('type') == 'text':
-                                text += block.get('text', '')
+                        text = ''.join(
+                            block.get('text', '') for block in msg.content
+                            if block.get('type') == 'text'
+                        )
                     else:
                         text = str(msg.content)
                     